@@ -54,12 +54,12 @@ function Invoke-Run {
 
 function Invoke-Test {
     Write-Host "Running tests..." -ForegroundColor Green
-    uv run pytest -v
+    uv run pytest -v -n auto
 }
 
 function Invoke-TestCov {
     Write-Host "Running tests with coverage..." -ForegroundColor Green
-    uv run pytest --cov=app --cov-report=term-missing --cov-report=html
+    uv run pytest -n auto --cov=app --cov-report=term-missing --cov-report=html
 }
 
 function Invoke-Lint {
@@ -3,9 +3,13 @@ Configuration settings for the Transcribe App.
 Loads settings from environment variables.
 """
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Settings that must never be logged
+SECRET_SETTINGS = frozenset({"azure_openai_api_key", "azure_speech_key"})
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -13,6 +17,8 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
+        # Ignore unrelated variables in .env (e.g. LOG_LEVEL) instead of failing
+        extra="ignore",
     )
     
     # Azure OpenAI Configuration
@@ -25,20 +31,46 @@ class Settings(BaseSettings):
     azure_openai_transcription_response_format: str = "diarized_json"
     # Diarization models require chunking_strategy; 'auto' is recommended.
     azure_openai_chunking_strategy_type: str | None = "auto"
+    # Retries (with exponential backoff) for rate limits, timeouts and 5xx errors
+    azure_openai_max_retries: int = 3
     
     # Azure Speech Service Configuration (alternative transcription backend)
     azure_speech_key: str = ""
     azure_speech_region: str = "westeurope"  # e.g., westeurope, eastus
     
     # Transcription engine: "openai" or "speech" (Azure Speech Service)
-    transcription_engine: str = "speech"
+    transcription_engine: Literal["openai", "speech"] = "speech"
     
     # Application settings
     upload_dir: str = "./uploads"
     max_file_size_mb: int = 300  # Azure Speech Fast Transcription limit is 300MB
+    # OpenAI-engine uploads up to this size skip the upload dir and stay in memory,
+    # as long as all in-memory jobs (queued or running) hold at most in_memory_total_mb
+    in_memory_upload_max_mb: int = 8
+    in_memory_total_mb: int = 64
+    
+    # Transcription worker pool: concurrent jobs and max queued jobs
+    worker_concurrency: int = 2
+    job_queue_size: int = 100
+    
+    # Job store: finished results are evicted after the TTL or when full
+    job_store_max_entries: int = 1000
+    job_store_ttl_seconds: int = 3600
+    
+    # Finished transcriptions are reused for identical uploads; set
+    # result_cache_dir to also persist them across restarts (pruned to the
+    # same entry limit and TTL). 0 entries turns the cache, and hashing
+    # uploads for it, off.
+    result_cache_max_entries: int = 128
+    result_cache_ttl_seconds: int = 86400
+    result_cache_dir: str = ""
     
     # Default language for transcription
     default_language: str = "nl"  # Dutch as default
+    
+    def to_log_json(self) -> str:
+        """Serialize non-secret settings to JSON for diagnostics."""
+        return self.model_dump_json(exclude=SECRET_SETTINGS)
 
 
 @lru_cache()
@@ -1,27 +1,33 @@
 """
 Main FastAPI application for the Transcription PoC.
 """
+import asyncio
+import hashlib
+import io
 import os
+import sys
 import logging
+import time
 import uuid
-import shutil
+from contextlib import asynccontextmanager
 from pathlib import Path
-from datetime import datetime
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks
+from datetime import datetime, timezone
+from typing import BinaryIO
+
+import aiofiles
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.services.speech_service import get_transcriber, TranscriptionResult
+from app.services.speech_service import close_transcriber, get_transcriber, TranscriptionResult
+from app.services.azure_speech_service import close_speech_transcriber, get_speech_transcriber
 from app.services.export_service import ExportService
+from app.services.job_store import JobStore
+from app.services.result_cache import ResultCache, cache_key
 from app.services.audio_converter import ACCEPTED_FORMATS, NATIVE_FORMATS, is_ffmpeg_available
 
-# Lazy import for Azure Speech (may not be configured)
-def _get_speech_transcriber():
-    from app.services.azure_speech_service import get_speech_transcriber
-    return get_speech_transcriber()
-
 
 def _configure_logging() -> None:
     """Configure logging in a way that plays nicely with uvicorn."""
@@ -44,14 +50,81 @@ def _configure_logging() -> None:
 _configure_logging()
 logger = logging.getLogger("app.main")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the transcription worker pool on startup and stop it on shutdown."""
+    queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=settings.job_queue_size)
+    app.state.job_queue = queue
+    # Bytes of audio held by in-memory jobs that are queued or running
+    app.state.in_memory_bytes = 0
+    workers = [
+        asyncio.create_task(_transcription_worker(queue))
+        for _ in range(settings.worker_concurrency)
+    ]
+    logger.info("Started transcription workers", extra={"workers": len(workers)})
+    # Create the transcribers now so the first job doesn't pay for it
+    for warm in (get_speech_transcriber, get_transcriber):
+        try:
+            warm()
+        except ValueError as e:
+            logger.info("Transcriber not configured", extra={"reason": str(e)})
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Loaded settings", extra={"settings": settings.to_log_json()})
+    try:
+        yield
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await close_speech_transcriber()
+        await close_transcriber()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Transcribe App",
     description="Proof of Concept for audio transcription with speaker diarization",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
-# Add CORS middleware
+# Settings
+settings = get_settings()
+
+# Store for transcription results (bounded; in production, use a shared backend)
+job_store = JobStore(
+    max_entries=settings.job_store_max_entries,
+    ttl_seconds=settings.job_store_ttl_seconds,
+)
+result_cache = ResultCache(
+    max_entries=settings.result_cache_max_entries,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    directory=settings.result_cache_dir or None,
+)
+
+# Room for the multipart boundaries and the other form fields of an upload
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Refuse uploads whose Content-Length is over the limit before the body is read.
+
+    The form is parsed before the endpoint runs, so this is the only place to
+    stop an oversized upload without receiving it. Requests without the header
+    (chunked) are still limited while the upload is saved.
+    """
+    if request.method == "POST" and request.url.path == "/api/transcribe":
+        content_length = request.headers.get("content-length")
+        max_bytes = settings.max_file_size_mb * 1024 * 1024 + UPLOAD_FORM_OVERHEAD
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            return JSONResponse(status_code=413, content={"detail": _file_too_large().detail})
+    return await call_next(request)
+
+
+# Add CORS middleware. Added last, so it is the outermost layer and also puts
+# its headers on responses from the middleware above.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -60,15 +133,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store for transcription results (in production, use a database)
-transcription_store: dict[str, TranscriptionResult] = {}
-
-# Settings
-settings = get_settings()
+# Configuration exposed to the frontend. Settings and format sets are immutable
+# after startup, so the payload is built once instead of on every request.
+_CONFIG_PAYLOAD = {
+    "max_file_size_mb": settings.max_file_size_mb,
+    "default_language": settings.default_language,
+    "default_engine": settings.transcription_engine,
+    "supported_engines": ["openai", "speech"],
+    "supported_formats": sorted([ext.lstrip(".") for ext in ACCEPTED_FORMATS]),
+    "native_formats": sorted([ext.lstrip(".") for ext in NATIVE_FORMATS]),
+    "ffmpeg_available": is_ffmpeg_available(),
+    "supported_languages": [
+        {"code": "nl", "name": "Nederlands"},
+        {"code": "en", "name": "English"},
+        {"code": "de", "name": "Deutsch"},
+        {"code": "fr", "name": "Français"},
+    ]
+}
+
+def _ext(name: str) -> str:
+    """Lower-cased extension of a filename (including the dot), or ''."""
+    i = name.rfind(".")
+    return name[i:].lower() if i > name.rfind("/") else ""
+
+
+# Error detail for unsupported uploads
+_SUPPORTED_FMTS_HELP = ", ".join(sorted(ACCEPTED_FORMATS))
 
 # Ensure upload directory exists
 Path(settings.upload_dir).mkdir(parents=True, exist_ok=True)
 
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 # Mount static files
 static_path = Path(__file__).parent / "static"
 if static_path.exists():
@@ -92,42 +189,32 @@ async def root():
     """
 
 
+_HEALTH_STATUS = {"status": "healthy", "version": "0.1.0"}
+
+# [monotonic time of last refresh, formatted timestamp]; refreshed at most every 100 ms
+_health_ts_cache: list = [float("-inf"), ""]
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "version": "0.1.0",
-        "timestamp": datetime.now().isoformat()
-    }
+    now = time.monotonic()
+    if now - _health_ts_cache[0] > 0.1:
+        _health_ts_cache[:] = [now, datetime.now(timezone.utc).isoformat()]
+    return {**_HEALTH_STATUS, "timestamp": _health_ts_cache[1]}
 
 
 @app.get("/api/config")
 async def get_config():
     """Get application configuration (non-sensitive)."""
-    return {
-        "max_file_size_mb": settings.max_file_size_mb,
-        "default_language": settings.default_language,
-        "default_engine": settings.transcription_engine,
-        "supported_engines": ["openai", "speech"],
-        "supported_formats": sorted([ext.lstrip(".") for ext in ACCEPTED_FORMATS]),
-        "native_formats": sorted([ext.lstrip(".") for ext in NATIVE_FORMATS]),
-        "ffmpeg_available": is_ffmpeg_available(),
-        "supported_languages": [
-            {"code": "nl", "name": "Nederlands"},
-            {"code": "en", "name": "English"},
-            {"code": "de", "name": "Deutsch"},
-            {"code": "fr", "name": "Français"},
-        ]
-    }
+    return _CONFIG_PAYLOAD
 
 
 @app.post("/api/transcribe")
 async def transcribe_audio(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     language: str = Form("nl"),
-    engine: str = Form(None),  # "openai" or "speech" (Azure Speech Service)
+    engine: str | None = Form(None),  # "openai" or "speech" (Azure Speech Service)
 ):
     """
     Upload and transcribe an audio file with speaker diarization.
@@ -147,23 +234,79 @@ async def transcribe_audio(
         raise HTTPException(status_code=400, detail="No file provided")
     
     # Check file extension (native + convertible formats)
-    file_ext = Path(file.filename).suffix.lower()
+    file_ext = _ext(file.filename)
     if file_ext not in ACCEPTED_FORMATS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file format. Allowed: {', '.join(sorted(ACCEPTED_FORMATS))}"
+            detail=f"Unsupported file format. Allowed: {_SUPPORTED_FMTS_HELP}"
         )
     
     # Generate job ID
     job_id = str(uuid.uuid4())
     
-    # Save file
-    upload_path = Path(settings.upload_dir) / f"{job_id}{file_ext}"
-    try:
-        with open(upload_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
+    job = {
+        "job_id": job_id,
+        "file_path": None,
+        "language": language,
+        "engine": selected_engine,
+    }
+    upload_path: Path | None = None
+    # Content digest of the upload for the result cache, computed while it is read
+    digest = hashlib.sha256() if settings.result_cache_max_entries > 0 else None
+    
+    if (
+        selected_engine == "openai"
+        and file_ext in NATIVE_FORMATS
+        and file.size is not None
+        and file.size <= min(settings.in_memory_upload_max_mb, settings.max_file_size_mb) * 1024 * 1024
+        and app.state.in_memory_bytes + file.size <= settings.in_memory_total_mb * 1024 * 1024
+    ):
+        # Small uploads that need no conversion are handed to the transcriber
+        # from memory, skipping the write to and re-read from the upload dir.
+        # Once in-memory jobs hold in_memory_total_mb, uploads go to disk;
+        # the bytes are reserved before the read so concurrent uploads see them.
+        app.state.in_memory_bytes += file.size
+        try:
+            data = await file.read()
+        except BaseException:
+            app.state.in_memory_bytes -= file.size
+            raise
+        app.state.in_memory_bytes += len(data) - file.size
+        if digest is not None:
+            digest.update(data)
+        job["audio"] = io.BytesIO(data)
+        job["filename"] = f"{job_id}{file_ext}"
+    else:
+        # Save file
+        upload_path = Path(settings.upload_dir) / f"{job_id}{file_ext}"
+        try:
+            await _save_upload(file, upload_path, settings.max_file_size_mb * 1024 * 1024, digest)
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
+        job["file_path"] = str(upload_path)
+    
+    # Identical audio with the same settings reuses the earlier transcript
+    job["cache_key"] = None if digest is None else cache_key(
+        digest.hexdigest(),
+        selected_engine,
+        language,
+        settings.azure_openai_deployment_name if selected_engine == "openai" else "",
+    )
+    cached = None if digest is None else await result_cache.get(job["cache_key"])
+    if cached is not None:
+        cached.filename = file.filename
+        cached.created_at = datetime.now()
+        await job_store.put(job_id, cached)
+        result_cache.link_job(job_id, job["cache_key"])
+        _release_in_memory(job)
+        if upload_path is not None:
+            upload_path.unlink(missing_ok=True)
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "message": f"Transcription loaded from cache (engine: {selected_engine})",
+            "engine": selected_engine,
+        }
     
     # Initialize result
     result = TranscriptionResult(
@@ -171,16 +314,22 @@ async def transcribe_audio(
         language=language,
         status="processing"
     )
-    transcription_store[job_id] = result
+    await job_store.put(job_id, result)
     
-    # Start transcription in background
-    background_tasks.add_task(
-        process_transcription,
-        job_id=job_id,
-        file_path=str(upload_path),
-        language=language,
-        engine=selected_engine,
-    )
+    # Queue transcription for the worker pool
+    try:
+        app.state.job_queue.put_nowait(job)
+    except asyncio.QueueFull:
+        _release_in_memory(job)
+        await job_store.delete(job_id)
+        if upload_path is not None:
+            upload_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=503,
+            detail="Too many transcriptions in progress. Please try again later.",
+        )
+    if job["cache_key"] is not None:
+        result_cache.link_job(job_id, job["cache_key"])
     
     return {
         "job_id": job_id,
@@ -190,19 +339,146 @@ async def transcribe_audio(
     }
 
 
-async def process_transcription(job_id: str, file_path: str, language: str, engine: str = "speech"):
-    """Background task to process transcription."""
+def _sendfile_all(src_fd: int, dst_fd: int, count: int) -> int:
+    """Copy up to ``count`` bytes between file descriptors inside the kernel and return the bytes copied."""
+    offset = 0
+    while offset < count:
+        sent = os.sendfile(dst_fd, src_fd, offset, count - offset)
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB",
+    )
+
+
+async def _save_upload(
+    file: UploadFile,
+    destination: Path,
+    max_bytes: int,
+    digest: "hashlib._Hash | None" = None,
+) -> None:
+    """
+    Stream an uploaded file to disk without blocking the event loop.
+
+    The upload is written to a hidden ``.part`` file next to ``destination``
+    and atomically renamed on success, so a crash or rejected upload never
+    leaves a truncated file behind. Uploads larger than ``max_bytes`` are
+    rejected with a 413 before (or while) writing. ``digest`` is updated
+    with the uploaded bytes as they are copied.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _file_too_large()
+
+    tmp_path = destination.with_name(f".{destination.name}.part")
     try:
-        logger.info(
-            "Background transcription started",
-            extra={"job_id": job_id, "language": language, "file_path": file_path, "engine": engine},
-        )
+        written = await _write_upload(file, tmp_path, max_bytes, digest)
+        if written > max_bytes:
+            raise _file_too_large()
+        os.replace(tmp_path, destination)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def _write_upload(
+    file: UploadFile,
+    path: Path,
+    max_bytes: int,
+    digest: "hashlib._Hash | None" = None,
+) -> int:
+    """
+    Copy an upload to ``path`` and return the number of bytes seen.
+
+    Large uploads are spooled to a temporary file by Starlette; on Linux those
+    are copied with ``os.sendfile`` in a worker thread (zero-copy) unless a
+    ``digest`` is wanted, which needs the bytes in Python anyway. A copy that
+    ends short of ``file.size`` raises OSError. Everything else is streamed
+    in chunks through aiofiles, hashing each chunk as it is written. Copying
+    stops as soon as ``max_bytes`` is exceeded.
+    """
+    size = file.size
+    written = 0
+    async with aiofiles.open(path, "wb") as out:
+        # Uploads that fit in one chunk gain nothing from sendfile, and asking
+        # an in-memory spool for its fileno() would write it to disk first
+        if (
+            digest is None
+            and sys.platform == "linux"
+            and size is not None
+            and UPLOAD_CHUNK_SIZE < size <= max_bytes
+        ):
+            try:
+                src_fd = file.file.fileno()
+            except (OSError, AttributeError):  # e.g. io.UnsupportedOperation for BytesIO
+                src_fd = None
+            if src_fd is not None:
+                copied = await asyncio.to_thread(_sendfile_all, src_fd, out.fileno(), size)
+                if copied != size:
+                    raise OSError(f"Upload copy ended after {copied} of {size} bytes")
+                return size
+
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_bytes:
+                break
+            if digest is not None:
+                digest.update(chunk)
+            await out.write(chunk)
+    return written
+
+
+def _release_in_memory(job: dict) -> None:
+    """Return an in-memory job's audio bytes to the in-memory budget."""
+    if job.get("audio") is not None:
+        app.state.in_memory_bytes -= job["audio"].getbuffer().nbytes
+
+
+async def _transcription_worker(queue: asyncio.Queue[dict]) -> None:
+    """Process queued transcription jobs one at a time."""
+    while True:
+        job = await queue.get()
+        try:
+            await process_transcription(**job)
+        finally:
+            _release_in_memory(job)
+            queue.task_done()
+
+
+async def process_transcription(
+    job_id: str,
+    file_path: str | None,
+    language: str,
+    engine: str = "speech",
+    audio: BinaryIO | None = None,
+    filename: str | None = None,
+    cache_key: str | None = None,
+):
+    """
+    Process a single transcription job (run by the worker pool).
+    
+    The audio is either an uploaded file at ``file_path`` or, for small
+    OpenAI-engine uploads, an in-memory ``audio`` file object named ``filename``.
+    Completed results are stored in the result cache under ``cache_key``.
+    """
+    log_info = logger.isEnabledFor(logging.INFO)
+    try:
+        if log_info:
+            logger.info(
+                "Background transcription started",
+                extra={"job_id": job_id, "language": language, "file_path": file_path, "engine": engine},
+            )
         
         if engine == "speech":
             # Use Azure Speech Service
             # NOTE: phrase_list temporarily disabled - causes Azure Speech to hang
             # from app.phrase_list import get_phrase_list
-            transcriber = _get_speech_transcriber()
+            transcriber = get_speech_transcriber()
             result = await transcriber.transcribe_file(
                 file_path,
                 language,
@@ -211,28 +487,39 @@ async def process_transcription(job_id: str, file_path: str, language: str, engi
         else:
             # Use Azure OpenAI (gpt-4o-transcribe-diarize)
             transcriber = get_transcriber()
-            result = await transcriber.transcribe_file(file_path, language)
+            result = await transcriber.transcribe_file(
+                audio if audio is not None else file_path,
+                language,
+                filename=filename,
+            )
         
-        transcription_store[job_id] = result
-        logger.info(
-            "Background transcription finished",
-            extra={"job_id": job_id, "status": result.status, "segments": len(result.segments), "engine": engine},
-        )
+        await job_store.put(job_id, result)
+        if cache_key is not None and result.status == "completed":
+            await result_cache.put(cache_key, result)
+        if log_info:
+            logger.info(
+                "Background transcription finished",
+                extra={"job_id": job_id, "status": result.status, "segments": len(result.segments), "engine": engine},
+            )
     except Exception as e:
-        if job_id in transcription_store:
-            transcription_store[job_id].status = "error"
-            transcription_store[job_id].error = str(e)
+        result = await job_store.get(job_id)
+        if result is not None:
+            result.status = "error"
+            result.error = str(e)
+            await job_store.put(job_id, result)
         logger.exception(
             "Background transcription failed",
             extra={"job_id": job_id, "file_path": file_path},
         )
     finally:
         # Clean up uploaded file
-        try:
-            os.remove(file_path)
-            logger.info("Cleaned up uploaded file", extra={"job_id": job_id, "file_path": file_path})
-        except:
-            pass
+        if file_path is not None:
+            try:
+                os.remove(file_path)
+                if log_info:
+                    logger.info("Cleaned up uploaded file", extra={"job_id": job_id, "file_path": file_path})
+            except:
+                pass
 
 
 @app.get("/api/transcription/{job_id}")
@@ -246,28 +533,27 @@ async def get_transcription(job_id: str):
     Returns:
         Transcription status and results
     """
-    if job_id not in transcription_store:
+    content = await job_store.get_json(job_id)
+    if content is None:
         raise HTTPException(status_code=404, detail="Transcription not found")
     
-    result = transcription_store[job_id]
-    return result.to_dict()
+    # The store keeps each result pre-encoded, so polling does no serialization
+    return Response(content=content, media_type="application/json")
 
 
 @app.get("/api/transcription/{job_id}/export/word")
 async def export_word(job_id: str):
     """Export transcription as Word document."""
-    if job_id not in transcription_store:
+    result = await job_store.get(job_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Transcription not found")
     
-    result = transcription_store[job_id]
     if result.status != "completed":
         raise HTTPException(status_code=400, detail="Transcription not yet completed")
     
-    buffer = ExportService.create_word_document(result)
-    
     filename = f"transcriptie_{job_id[:8]}.docx"
     return StreamingResponse(
-        buffer,
+        ExportService.stream_word_document(result),
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -276,18 +562,16 @@ async def export_word(job_id: str):
 @app.get("/api/transcription/{job_id}/export/pdf")
 async def export_pdf(job_id: str):
     """Export transcription as PDF document."""
-    if job_id not in transcription_store:
+    result = await job_store.get(job_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Transcription not found")
     
-    result = transcription_store[job_id]
     if result.status != "completed":
         raise HTTPException(status_code=400, detail="Transcription not yet completed")
     
-    buffer = ExportService.create_pdf_document(result)
-    
     filename = f"transcriptie_{job_id[:8]}.pdf"
     return StreamingResponse(
-        buffer,
+        ExportService.stream_pdf_document(result),
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -296,8 +580,8 @@ async def export_pdf(job_id: str):
 @app.delete("/api/transcription/{job_id}")
 async def delete_transcription(job_id: str):
     """Delete a transcription result."""
-    if job_id not in transcription_store:
+    if not await job_store.delete(job_id):
         raise HTTPException(status_code=404, detail="Transcription not found")
+    await result_cache.delete_job(job_id)
     
-    del transcription_store[job_id]
     return {"message": "Transcription deleted"}
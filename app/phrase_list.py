@@ -16,6 +16,11 @@ CASE_SPECIFIC_PHRASES: list[str] = [
 ]
 
 
-def get_phrase_list() -> list[str]:
+# Combined phrase list, built once at import time
+_ALL_PHRASES: tuple[str, ...] = tuple(CASE_SPECIFIC_PHRASES)
+
+
+def get_phrase_list() -> tuple[str, ...]:
     """Get the complete phrase list for transcription."""
-    return CASE_SPECIFIC_PHRASES
+    return _ALL_PHRASES
+
@@ -2,34 +2,79 @@
 Audio conversion utilities using ffmpeg.
 Converts unsupported formats (ASF, WMA, AVI, etc.) to WAV for transcription.
 """
+import asyncio
+import json
 import os
+import re
 import subprocess
 import shutil
+import threading
+from collections import OrderedDict, deque
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable
 
 
 # Formats natively supported by gpt-4o-transcribe-diarize
-NATIVE_FORMATS = {".mp3", ".mp4", ".m4a", ".wav", ".webm", ".mpeg", ".mpga"}
+NATIVE_FORMATS: frozenset[str] = frozenset(
+    {".mp3", ".mp4", ".m4a", ".wav", ".webm", ".mpeg", ".mpga"}
+)
 
 # Formats we can convert using ffmpeg
-CONVERTIBLE_FORMATS = {".asf", ".wma", ".avi", ".flv", ".ogg", ".flac", ".aac", ".wmv"}
+CONVERTIBLE_FORMATS: frozenset[str] = frozenset(
+    {".asf", ".wma", ".avi", ".flv", ".ogg", ".flac", ".aac", ".wmv"}
+)
 
 # All accepted formats (native + convertible)
-ACCEPTED_FORMATS = NATIVE_FORMATS | CONVERTIBLE_FORMATS
+ACCEPTED_FORMATS: frozenset[str] = NATIVE_FORMATS | CONVERTIBLE_FORMATS
 
+FFMPEG_MISSING_MESSAGE = (
+    "ffmpeg is not installed. Please install ffmpeg to convert audio files.\n"
+    "Ubuntu/Debian: sudo apt-get install ffmpeg\n"
+    "macOS: brew install ffmpeg\n"
+    "Windows: Download from https://ffmpeg.org/download.html"
+)
 
+# Longest piece long recordings are split into, and the most bytes a piece
+# may take; 16 kHz 16-bit WAV grows by 32 kB/s per channel, so pieces of
+# audio with more than two channels are made shorter to stay under the
+# 25MB upload limit
+SPLIT_CHUNK_SECONDS = 300.0
+SPLIT_CHUNK_BYTES = 20 * 1024 * 1024
+
+_SILENCE_RE = re.compile(r"silence_(start|end): (-?\d+(?:\.\d+)?)")
+
+# ffprobe results keyed by (path, mtime, size)
+AUDIO_INFO_CACHE_SIZE = 256
+_audio_info_cache: OrderedDict[tuple[str, int, int], dict] = OrderedDict()
+_audio_info_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
 def is_ffmpeg_available() -> bool:
-    """Check if ffmpeg is installed and available."""
+    """Check if ffmpeg is installed and available (cached per process)."""
     return shutil.which("ffmpeg") is not None
 
 
+def reset_ffmpeg_cache() -> None:
+    """Forget the cached ffmpeg lookup and ffprobe results (e.g. in tests)."""
+    is_ffmpeg_available.cache_clear()
+    with _audio_info_lock:
+        _audio_info_cache.clear()
+
+
 def needs_conversion(file_path: str) -> bool:
     """Check if the file needs to be converted before transcription."""
     ext = Path(file_path).suffix.lower()
     return ext in CONVERTIBLE_FORMATS
 
 
-def convert_to_wav(input_path: str, output_path: str | None = None) -> str:
+def convert_to_wav(
+    input_path: str,
+    output_path: str | None = None,
+    on_progress: Callable[[float], None] | None = None,
+) -> str:
     """
     Convert audio file to WAV format using ffmpeg.
     
@@ -37,6 +82,8 @@ def convert_to_wav(input_path: str, output_path: str | None = None) -> str:
         input_path: Path to the input audio file
         output_path: Optional output path. If not provided, creates a .wav 
                      file in the same directory.
+        on_progress: Optional callback receiving the conversion progress
+                     as a percentage (0-100)
     
     Returns:
         Path to the converted WAV file
@@ -45,12 +92,7 @@ def convert_to_wav(input_path: str, output_path: str | None = None) -> str:
         RuntimeError: If ffmpeg is not available or conversion fails
     """
     if not is_ffmpeg_available():
-        raise RuntimeError(
-            "ffmpeg is not installed. Please install ffmpeg to convert audio files.\n"
-            "Ubuntu/Debian: sudo apt-get install ffmpeg\n"
-            "macOS: brew install ffmpeg\n"
-            "Windows: Download from https://ffmpeg.org/download.html"
-        )
+        raise RuntimeError(FFMPEG_MISSING_MESSAGE)
     
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
@@ -60,69 +102,380 @@ def convert_to_wav(input_path: str, output_path: str | None = None) -> str:
         input_path_obj = Path(input_path)
         output_path = str(input_path_obj.with_suffix(".wav"))
     
+    # Total duration is only needed to turn ffmpeg's position into a percentage
+    duration = get_audio_duration(input_path) if on_progress else None
+    
+    try:
+        returncode, stderr = _run_ffmpeg_with_progress(
+            _wav_cmd(input_path, output_path),
+            timeout=300,  # 5 minute timeout for large files
+            duration=duration,
+            on_progress=on_progress,
+        )
+        
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg conversion failed: {stderr}")
+        
+        if not os.path.exists(output_path):
+            raise RuntimeError("Conversion completed but output file not found")
+        
+        return output_path
+        
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Audio conversion timed out (>5 minutes)")
+    except Exception as e:
+        raise RuntimeError(f"Audio conversion failed: {str(e)}")
+
+
+def _run_ffmpeg_with_progress(
+    cmd: list[str],
+    timeout: float,
+    duration: float | None = None,
+    on_progress: Callable[[float], None] | None = None,
+) -> tuple[int, str]:
+    """
+    Run ffmpeg, reading its stderr line by line as it runs.
+    
+    ffmpeg is asked for machine-readable progress on stderr, which is
+    reported through on_progress when the input duration is known. Only the
+    last lines of other stderr output are kept, so memory stays bounded on
+    long inputs.
+    
+    Returns (returncode, stderr tail).
+    
+    Raises:
+        subprocess.TimeoutExpired: If ffmpeg runs longer than timeout seconds
+    """
+    # -progress must come before the output file to apply to it
+    cmd = [cmd[0], "-progress", "pipe:2", "-nostats", *cmd[1:]]
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    
+    # Reading stderr blocks, so enforce the timeout by killing the process
+    timed_out = threading.Event()
+    
+    def _kill() -> None:
+        timed_out.set()
+        process.kill()
+    
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    stderr_tail: deque[str] = deque(maxlen=500)
+    try:
+        for line in process.stderr:
+            key, sep, value = line.partition("=")
+            if not sep or " " in key:
+                stderr_tail.append(line)
+            # Despite its name, out_time_ms is reported in microseconds
+            elif key == "out_time_ms" and duration and on_progress:
+                try:
+                    on_progress(min(int(value) / 1_000_000 / duration * 100, 100.0))
+                except ValueError:
+                    pass
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stderr.close()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode, "".join(stderr_tail)
+
+
+def _wav_cmd(input_path: str, output_path: str) -> list[str]:
+    """Build the ffmpeg command converting input_path to a WAV file."""
     # ffmpeg command to convert to WAV
     # -y: overwrite output file without asking
+    # -threads 0: let ffmpeg pick the decoder thread count
     # -i: input file
+    # -vn -sn -dn: skip video, subtitle and data streams (no decode work for containers)
+    # -map a:0: only the first audio stream
     # -acodec pcm_s16le: 16-bit PCM audio codec (standard WAV)
     # -ar 16000: 16kHz sample rate (good for speech recognition)
+    # -f wav: explicit output format instead of guessing from the extension
     # Note: We preserve stereo (-ac 2) to help diarization when speakers are on different channels
     #       Azure Speech can handle stereo and mono files
-    cmd = [
+    return [
         "ffmpeg",
         "-y",
+        "-threads", "0",
         "-i", input_path,
+        "-vn", "-sn", "-dn",
+        "-map", "a:0",
         "-acodec", "pcm_s16le",
         "-ar", "16000",
+        "-f", "wav",
         output_path
     ]
+
+
+def estimate_wav_size(file_path: str) -> int | None:
+    """
+    Estimate the size in bytes of convert_to_wav's output from ffprobe info.
+    
+    The WAV keeps the source's channels at 16 kHz, 16-bit. Returns None if
+    the duration or channel count cannot be determined.
+    """
+    info = get_audio_info(file_path)
+    if not info["duration"] or not info["channels"]:
+        return None
+    # 44-byte RIFF header plus 2 bytes per sample per channel
+    return 44 + int(info["duration"] * 16000 * info["channels"] * 2)
+
+
+def split_at_silence(
+    input_path: str,
+    chunk_seconds: float = SPLIT_CHUNK_SECONDS,
+    max_bytes: int = SPLIT_CHUNK_BYTES,
+) -> list[tuple[float, str]]:
+    """
+    Split audio into WAV pieces of at most chunk_seconds, cutting in silences.
+    
+    Each piece is written next to the input as ``<stem>_chunk<N>.wav``. A
+    piece is cut at the last silence in the second half of its window, or
+    hard at the window's end when it has no silence. The window is shortened
+    so a piece in the source's channel count stays under max_bytes; when the
+    channel count is unknown, pieces are downmixed to stereo.
+    
+    Args:
+        input_path: Path to the input audio file
+        chunk_seconds: Maximum length of a piece in seconds
+        max_bytes: Maximum size of a piece in bytes
+    
+    Returns:
+        (start offset in seconds, path) for each piece, in order
+        
+    Raises:
+        RuntimeError: If ffmpeg is not available or splitting fails
+    """
+    if not is_ffmpeg_available():
+        raise RuntimeError(FFMPEG_MISSING_MESSAGE)
     
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    info = get_audio_info(input_path)
+    duration = info["duration"]
+    if not duration:
+        raise RuntimeError("Could not determine audio duration for splitting")
+    channels = info["channels"]
+    chunk_seconds = min(chunk_seconds, _split_chunk_seconds(channels or 2, max_bytes))
+    
+    bounds = [0.0, *_choose_cut_points(duration, detect_silences(input_path), chunk_seconds), duration]
+    source = Path(input_path)
+    chunks: list[tuple[float, str]] = []
+    try:
+        for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            output_path = str(source.with_name(f"{source.stem}_chunk{index:03d}.wav"))
+            result = subprocess.run(
+                _wav_segment_cmd(input_path, output_path, start, end - start, downmix=not channels),
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg split failed: {result.stderr}")
+            chunks.append((start, output_path))
+    except BaseException:
+        for _, chunk_path in chunks:
+            with suppress(OSError):
+                os.remove(chunk_path)
+        raise
+    
+    return chunks
+
+
+def detect_silences(input_path: str, noise: str = "-30dB", min_silence: float = 0.5) -> list[tuple[float, float]]:
+    """
+    Find silent stretches in an audio file with ffmpeg's silencedetect filter.
+    
+    Returns (start, end) in seconds for each silence; a silence still open at
+    the end of the file is left out.
+    """
     try:
         result = subprocess.run(
-            cmd,
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-i", input_path,
+                "-vn", "-sn", "-dn",
+                "-map", "a:0",
+                "-af", f"silencedetect=noise={noise}:d={min_silence}",
+                "-f", "null",
+                "-",
+            ],
             capture_output=True,
             text=True,
-            timeout=300  # 5 minute timeout for large files
+            timeout=300,
         )
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"ffmpeg conversion failed: {result.stderr}")
-        
-        if not os.path.exists(output_path):
-            raise RuntimeError("Conversion completed but output file not found")
-        
-        return output_path
-        
     except subprocess.TimeoutExpired:
-        raise RuntimeError("Audio conversion timed out (>5 minutes)")
-    except Exception as e:
-        raise RuntimeError(f"Audio conversion failed: {str(e)}")
+        raise RuntimeError("Silence detection timed out (>5 minutes)")
+    
+    if result.returncode != 0:
+        raise RuntimeError(f"Silence detection failed: {result.stderr}")
+    
+    return _parse_silences(result.stderr)
 
 
-def get_audio_duration(file_path: str) -> float | None:
+def _parse_silences(stderr: str) -> list[tuple[float, float]]:
+    """Pair up the silence_start/silence_end lines silencedetect logs."""
+    silences = []
+    start = None
+    for kind, value in _SILENCE_RE.findall(stderr):
+        if kind == "start":
+            start = max(float(value), 0.0)
+        elif start is not None:
+            silences.append((start, float(value)))
+            start = None
+    return silences
+
+
+def _choose_cut_points(
+    duration: float,
+    silences: list[tuple[float, float]],
+    chunk_seconds: float,
+) -> list[float]:
+    """Pick split offsets so no piece is longer than chunk_seconds."""
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts = []
+    position = 0.0
+    while duration - position > chunk_seconds:
+        limit = position + chunk_seconds
+        # Prefer the latest silence, but not so early that pieces get tiny
+        candidates = [m for m in midpoints if position + chunk_seconds / 2 <= m <= limit]
+        position = candidates[-1] if candidates else limit
+        cuts.append(position)
+    return cuts
+
+
+def _split_chunk_seconds(channels: int, max_bytes: int = SPLIT_CHUNK_BYTES) -> float:
+    """Longest stretch of 16 kHz 16-bit WAV with this many channels that fits in max_bytes."""
+    return (max_bytes - 44) / (16000 * 2 * channels)
+
+
+def _wav_segment_cmd(
+    input_path: str,
+    output_path: str,
+    start: float,
+    length: float,
+    downmix: bool = False,
+) -> list[str]:
+    """Build the ffmpeg command converting one stretch of input_path to WAV."""
+    cmd = _wav_cmd(input_path, output_path)
+    # Seeking before -i is fast and frame-accurate for audio
+    index = cmd.index("-i")
+    cmd[index:index] = ["-ss", f"{start:.3f}", "-t", f"{length:.3f}"]
+    if downmix:
+        # Unknown channel count: cap it at the two the piece length assumes
+        index = cmd.index("-acodec")
+        cmd[index:index] = ["-ac", "2"]
+    return cmd
+
+
+async def _run_async(cmd: list[str], timeout: float) -> tuple[int, str, str]:
     """
-    Get the duration of an audio file in seconds using ffprobe.
+    Run a command without blocking the event loop.
     
-    Returns None if duration cannot be determined.
+    Returns (returncode, stdout, stderr). The process is killed if it times
+    out or the caller is cancelled.
+    
+    Raises:
+        asyncio.TimeoutError: If the command runs longer than timeout seconds
     """
-    if not is_ffmpeg_available():
-        return None
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    return (
+        process.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
+async def convert_to_ogg_opus_stream(input_path: str) -> asyncio.subprocess.Process:
+    """
+    Start ffmpeg converting an audio file to Ogg/Opus on its stdout.
     
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path
+    Opus at 24 kbit/s is a fraction of the size of 16 kHz PCM WAV, which makes
+    uploads much faster. Only use this for services that accept Ogg/Opus
+    (Azure Speech does; the OpenAI transcription API does not).
+    
+    The caller reads ``process.stdout`` while ffmpeg is still encoding, so no
+    intermediate file is written. The caller must also drain
+    ``process.stderr`` and wait for the process to exit.
+    
+    Args:
+        input_path: Path to the input audio file
+    
+    Returns:
+        The running ffmpeg process
+        
+    Raises:
+        RuntimeError: If ffmpeg is not available
+    """
+    return await _start_ffmpeg_stream(input_path, _ogg_opus_cmd(input_path, "pipe:1"))
+
+
+def _ogg_opus_cmd(input_path: str, output_path: str) -> list[str]:
+    """Build the ffmpeg command converting input_path to Ogg/Opus."""
+    # Same stream selection as _wav_cmd. Channels are kept as-is (no -ac 1)
+    # for the same diarization reason as the WAV conversion.
+    return [
+        "ffmpeg",
+        "-y",
+        "-threads", "0",
+        "-i", input_path,
+        "-vn", "-sn", "-dn",
+        "-map", "a:0",
+        "-c:a", "libopus",
+        "-b:a", "24k",
+        "-ar", "16000",
+        "-f", "ogg",
+        output_path
     ]
+
+
+async def _start_ffmpeg_stream(input_path: str, cmd: list[str]) -> asyncio.subprocess.Process:
+    """Start an ffmpeg command writing to stdout, with only errors on stderr."""
+    if not is_ffmpeg_available():
+        raise RuntimeError("ffmpeg is not installed")
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-    except (subprocess.TimeoutExpired, ValueError):
-        pass
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    return await asyncio.create_subprocess_exec(
+        cmd[0], "-nostdin", "-v", "error", *cmd[1:],
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+
+def get_audio_duration(file_path: str) -> float | None:
+    """
+    Get the duration of an audio file in seconds using ffprobe.
     
-    return None
+    Returns None if duration cannot be determined.
+    """
+    return get_audio_info(file_path)["duration"]
 
 
 def extract_audio_from_container(input_path: str, output_path: str | None = None) -> str:
@@ -150,19 +503,9 @@ def extract_audio_from_container(input_path: str, output_path: str | None = None
         input_path_obj = Path(input_path)
         output_path = str(input_path_obj.with_suffix(".wma"))
     
-    # Extract audio without re-encoding (-c:a copy)
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i", input_path,
-        "-vn",  # No video
-        "-c:a", "copy",  # Copy audio codec (no re-encoding)
-        output_path
-    ]
-    
     try:
         result = subprocess.run(
-            cmd,
+            _extract_cmd(input_path, output_path),
             capture_output=True,
             text=True,
             timeout=120
@@ -180,24 +523,123 @@ def extract_audio_from_container(input_path: str, output_path: str | None = None
         raise RuntimeError("Audio extraction timed out")
 
 
+def _extract_cmd(input_path: str, output_path: str) -> list[str]:
+    """Build the ffmpeg command copying the audio stream out of a container."""
+    # Extract audio without re-encoding (-c:a copy)
+    return [
+        "ffmpeg",
+        "-y",
+        "-i", input_path,
+        "-vn", "-sn", "-dn",  # No video, subtitle or data streams
+        "-map", "a:0",  # First audio stream only
+        "-c:a", "copy",  # Copy audio codec (no re-encoding)
+        "-f", "asf",  # WMA audio goes back into an ASF container
+        output_path
+    ]
+
+
+async def extract_audio_from_container_async(
+    input_path: str, output_path: str | None = None
+) -> str:
+    """
+    Extract audio from a container format without blocking the event loop.
+    
+    Same as extract_audio_from_container, but runs ffmpeg as an asyncio
+    subprocess.
+    """
+    if not is_ffmpeg_available():
+        raise RuntimeError("ffmpeg is not installed")
+    
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    if output_path is None:
+        output_path = str(Path(input_path).with_suffix(".wma"))
+    
+    try:
+        returncode, _, stderr = await _run_async(_extract_cmd(input_path, output_path), timeout=120)
+    except asyncio.TimeoutError:
+        raise RuntimeError("Audio extraction timed out")
+    
+    if returncode != 0:
+        raise RuntimeError(f"Audio extraction failed: {stderr}")
+    
+    if not os.path.exists(output_path):
+        raise RuntimeError("Extraction completed but output file not found")
+    
+    return output_path
+
+
 def get_audio_info(file_path: str) -> dict:
     """
     Get audio file information using ffprobe.
     
+    Results are cached per (path, mtime, size), so repeated lookups for an
+    unchanged file do not start another ffprobe process.
+    
     Returns dict with format, duration, sample_rate, channels, etc.
     """
-    info = {
+    info = _empty_audio_info(file_path)
+    if not is_ffmpeg_available():
+        return info
+    
+    key = _audio_info_key(file_path)
+    if key is None:
+        return info
+    
+    cached = _get_cached_audio_info(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        result = subprocess.run(_probe_cmd(file_path), capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, OSError):
+        # OSError: ffprobe missing even though ffmpeg is installed
+        return info
+    
+    if result.returncode == 0 and _parse_probe_output(result.stdout, info):
+        _cache_audio_info(key, info)
+    return info
+
+
+def _empty_audio_info(file_path: str) -> dict:
+    return {
         "format": Path(file_path).suffix.lower(),
         "duration": None,
         "sample_rate": None,
         "channels": None,
         "codec": None,
     }
-    
-    if not is_ffmpeg_available():
-        return info
-    
-    cmd = [
+
+
+def _audio_info_key(file_path: str) -> tuple[str, int, int] | None:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (file_path, stat.st_mtime_ns, stat.st_size)
+
+
+def _get_cached_audio_info(key: tuple[str, int, int]) -> dict | None:
+    with _audio_info_lock:
+        info = _audio_info_cache.get(key)
+        if info is None:
+            return None
+        _audio_info_cache.move_to_end(key)
+    # Copy so callers can't mutate the cached entry
+    return dict(info)
+
+
+def _cache_audio_info(key: tuple[str, int, int], info: dict) -> None:
+    with _audio_info_lock:
+        _audio_info_cache[key] = dict(info)
+        while len(_audio_info_cache) > AUDIO_INFO_CACHE_SIZE:
+            _audio_info_cache.popitem(last=False)
+
+
+def _probe_cmd(file_path: str) -> list[str]:
+    """Build a single ffprobe call for format and first audio stream info."""
+    return [
         "ffprobe",
         "-v", "error",
         "-select_streams", "a:0",
@@ -205,23 +647,22 @@ def get_audio_info(file_path: str) -> dict:
         "-of", "json",
         file_path
     ]
-    
+
+
+def _parse_probe_output(stdout: str, info: dict) -> bool:
+    """Fill info from ffprobe JSON output. Returns False if it can't be parsed."""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            import json
-            data = json.loads(result.stdout)
-            
-            if "format" in data and "duration" in data["format"]:
-                info["duration"] = float(data["format"]["duration"])
-            
-            if "streams" in data and len(data["streams"]) > 0:
-                stream = data["streams"][0]
-                info["codec"] = stream.get("codec_name")
-                info["sample_rate"] = int(stream["sample_rate"]) if "sample_rate" in stream else None
-                info["channels"] = int(stream["channels"]) if "channels" in stream else None
-                
-    except (subprocess.TimeoutExpired, ValueError, KeyError):
-        pass
+        data = json.loads(stdout)
+        
+        if "format" in data and "duration" in data["format"]:
+            info["duration"] = float(data["format"]["duration"])
+        
+        if "streams" in data and len(data["streams"]) > 0:
+            stream = data["streams"][0]
+            info["codec"] = stream.get("codec_name")
+            info["sample_rate"] = int(stream["sample_rate"]) if "sample_rate" in stream else None
+            info["channels"] = int(stream["channels"]) if "channels" in stream else None
+    except (ValueError, KeyError):
+        return False
     
-    return info
+    return True
@@ -5,27 +5,46 @@ Better Dutch language support than OpenAI models.
 
 Docs: https://learn.microsoft.com/en-us/azure/ai-services/speech-service/fast-transcription-create
 """
+import asyncio
 import json
 import logging
 import os
+import threading
+import uuid
+from collections.abc import AsyncIterator, Mapping
+from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Literal, Sequence
 
+import aiofiles
 import httpx
+import orjson
 
 from app.config import get_settings
 from app.services.audio_converter import (
-    convert_to_wav,
-    extract_audio_from_container,
+    convert_to_ogg_opus_stream,
+    extract_audio_from_container_async,
     is_ffmpeg_available,
 )
+from app.services.transcript import TranscriptResultMixin
 
 logger = logging.getLogger(__name__)
 
 # API version for Fast Transcription (2025-10-15 has improved diarization)
 FAST_TRANSCRIPTION_API_VERSION = "2025-10-15"
 
+# Chunk size used when streaming audio to Azure
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Seconds to wait for a killed ffmpeg stream to exit
+FFMPEG_EXIT_TIMEOUT = 5.0
+
+# Seconds a streamed conversion may take to produce all its output
+FFMPEG_CONVERSION_TIMEOUT = 300.0
+
 # Formats natively supported by Azure Speech Fast Transcription
 # Source: https://learn.microsoft.com/en-us/azure/ai-services/speech-service/batch-transcription-audio-data
 AZURE_SPEECH_NATIVE_FORMATS = {
@@ -39,21 +58,143 @@ ASF_LIKE_CONTAINERS = {".asf"}
 # Formats that need full conversion (re-encoding) for Azure Speech
 AZURE_SPEECH_CONVERTIBLE_FORMATS = {".avi", ".flv", ".wmv", ".m4a", ".mp4"}
 
+# How transcribe_file prepares an upload: as-is, audio extracted, or re-encoded
+SpeechAction = Literal["native", "extract", "convert"]
+
 
-def _needs_conversion_for_speech(file_path: str) -> bool:
-    """Check if the file needs conversion for Azure Speech Fast Transcription."""
+def _route_file(file_path: str) -> tuple[SpeechAction, str]:
+    """Decide how to prepare a file for Azure Speech; returns (action, extension)."""
     ext = os.path.splitext(file_path)[1].lower()
-    # Only convert if it's not in the native formats and not an extractable container
-    return ext not in AZURE_SPEECH_NATIVE_FORMATS and ext not in ASF_LIKE_CONTAINERS
+    if ext in ASF_LIKE_CONTAINERS:
+        return "extract", ext
+    if ext in AZURE_SPEECH_NATIVE_FORMATS:
+        return "native", ext
+    return "convert", ext
+
+
+# Short language code -> Azure Speech locale
+_LOCALE_MAP: Mapping[str, str] = MappingProxyType({
+    "nl": "nl-NL",
+    "en": "en-US",
+    "de": "de-DE",
+    "fr": "fr-FR",
+    "es": "es-ES",
+    "it": "it-IT",
+})
+
+# File extension -> upload content type
+_CONTENT_TYPE_MAP: Mapping[str, str] = MappingProxyType({
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".flac": "audio/flac",
+    ".m4a": "audio/mp4",
+    ".mp4": "audio/mp4",
+    ".webm": "audio/webm",
+    ".wma": "audio/x-ms-wma",
+    ".aac": "audio/aac",
+})
+
+
+async def _iter_stream(reader: asyncio.StreamReader, deadline: float) -> AsyncIterator[bytes]:
+    """
+    Yield chunks from a stream reader until EOF.
 
+    Raises:
+        RuntimeError: If EOF is not reached by ``deadline`` (event loop time);
+            the HTTP timeouts only cover socket operations, not a stalled ffmpeg
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            chunk = await asyncio.wait_for(reader.read(UPLOAD_CHUNK_SIZE), timeout=deadline - loop.time())
+        except TimeoutError:
+            raise RuntimeError("Audio conversion timed out (>5 minutes)") from None
+        if not chunk:
+            return
+        yield chunk
 
-def _needs_extraction_for_speech(file_path: str) -> bool:
-    """Check if the file is a container that can have audio extracted."""
-    ext = os.path.splitext(file_path)[1].lower()
-    return ext in ASF_LIKE_CONTAINERS
 
+async def _iter_file(path: str) -> AsyncIterator[bytes]:
+    """Yield chunks of a file, reading it off the event loop."""
+    async with aiofiles.open(path, "rb") as audio_file:
+        while chunk := await audio_file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+async def _stop_conversion(
+    conversion: asyncio.subprocess.Process,
+    stderr_task: asyncio.Task | None,
+) -> None:
+    """
+    Kill an ffmpeg stream that may still be running and reap it.
+
+    The process only counts as exited once its pipes are closed, so whatever
+    is left on stdout is drained first; the final wait is bounded so a stuck
+    process can never hold up the caller.
+    """
+    if conversion.returncode is None:
+        with suppress(ProcessLookupError):
+            conversion.kill()
+    with suppress(OSError):
+        while await conversion.stdout.read(UPLOAD_CHUNK_SIZE):
+            pass
+    if stderr_task is not None:
+        with suppress(Exception):
+            await stderr_task
+    try:
+        await asyncio.wait_for(conversion.wait(), timeout=FFMPEG_EXIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("ffmpeg did not exit after being killed", extra={"pid": conversion.pid})
+
+
+async def _check_conversion(
+    conversion: asyncio.subprocess.Process,
+    stderr_task: asyncio.Task[bytes],
+) -> None:
+    """
+    Wait for an ffmpeg stream whose output was fully read and check its exit.
+
+    Raises:
+        RuntimeError: If ffmpeg failed (with its stderr) or does not exit
+    """
+    try:
+        returncode = await asyncio.wait_for(conversion.wait(), timeout=FFMPEG_EXIT_TIMEOUT)
+    except TimeoutError:
+        raise RuntimeError("ffmpeg did not exit after finishing its output") from None
+    if returncode != 0:
+        stderr = (await stderr_task).decode(errors="replace")
+        raise RuntimeError(f"ffmpeg conversion failed: {stderr}")
+
+
+async def _multipart_body(
+    boundary: str,
+    definition_json: str,
+    filename: str,
+    content_type: str,
+    audio: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    """
+    Encode a Fast Transcription multipart request body as a stream.
 
-@dataclass
+    httpx's ``files=`` needs a sync file object that it reads on the event
+    loop; this sends audio from an async iterator (ffmpeg output or an
+    aiofiles reader) with chunked transfer encoding.
+    """
+    yield (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="definition"\r\n\r\n'
+        f"{definition_json}\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="audio"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    async for chunk in audio:
+        yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+@dataclass(slots=True)
 class SpeechSegment:
     """Represents a segment of transcribed speech."""
     speaker_id: str
@@ -62,9 +203,11 @@ class SpeechSegment:
     end_time: float = 0.0
 
 
-@dataclass
-class SpeechTranscriptionResult:
+@dataclass(slots=True)
+class SpeechTranscriptionResult(TranscriptResultMixin):
     """Complete transcription result with all segments."""
+    segment_type = SpeechSegment
+
     segments: list[SpeechSegment] = field(default_factory=list)
     full_text: str = ""
     status: str = "pending"
@@ -73,47 +216,10 @@ class SpeechTranscriptionResult:
     created_at: datetime = field(default_factory=datetime.now)
     language: str = "nl"
     duration_seconds: float = 0.0
-
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "segments": [
-                {
-                    "speaker_id": s.speaker_id,
-                    "text": s.text,
-                    "start_time": s.start_time,
-                    "end_time": s.end_time,
-                }
-                for s in self.segments
-            ],
-            "full_text": self.full_text,
-            "status": self.status,
-            "error": self.error,
-            "filename": self.filename,
-            "created_at": self.created_at.isoformat(),
-            "language": self.language,
-            "duration_seconds": self.duration_seconds,
-        }
-
-    def get_formatted_transcript(self) -> str:
-        """Get formatted transcript with speaker labels."""
-        lines = []
-        current_speaker = None
-        current_text = []
-
-        for segment in self.segments:
-            if segment.speaker_id != current_speaker:
-                if current_text:
-                    lines.append(f"{current_speaker}: {' '.join(current_text)}")
-                current_speaker = segment.speaker_id
-                current_text = [segment.text]
-            else:
-                current_text.append(segment.text)
-
-        if current_text:
-            lines.append(f"{current_speaker}: {' '.join(current_text)}")
-
-        return "\n\n".join(lines)
+    # Serialized segments, reused until the segment list is replaced or resized
+    _segments_cache: tuple[list[SpeechSegment], int, list[dict]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 class AzureSpeechTranscriber:
@@ -131,6 +237,8 @@ class AzureSpeechTranscriber:
     def __init__(self):
         self.settings = get_settings()
         self._validate_settings()
+        # Shared HTTP client so TCP/TLS connections are reused across transcriptions
+        self._client: httpx.AsyncClient | None = None
 
     def _validate_settings(self):
         """Validate that required settings are present."""
@@ -145,40 +253,35 @@ class AzureSpeechTranscriber:
                 "Please configure it in your .env file."
             )
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(600.0),
+                limits=httpx.Limits(max_keepalive_connections=8),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def _get_locale(self, language: str) -> str:
         """Convert short language code to Azure Speech locale."""
-        language_map = {
-            "nl": "nl-NL",
-            "en": "en-US",
-            "de": "de-DE",
-            "fr": "fr-FR",
-            "es": "es-ES",
-            "it": "it-IT",
-        }
-        return language_map.get(language, f"{language}-{language.upper()}")
-
-    def _get_content_type(self, file_path: str) -> str:
-        """Get content type based on file extension."""
-        ext = os.path.splitext(file_path)[1].lower()
-        content_types = {
-            ".wav": "audio/wav",
-            ".mp3": "audio/mpeg",
-            ".ogg": "audio/ogg",
-            ".flac": "audio/flac",
-            ".m4a": "audio/mp4",
-            ".mp4": "audio/mp4",
-            ".webm": "audio/webm",
-            ".wma": "audio/x-ms-wma",
-            ".aac": "audio/aac",
-        }
-        return content_types.get(ext, "audio/wav")
+        return _LOCALE_MAP.get(language, f"{language}-{language.upper()}")
+
+    def _get_content_type(self, ext: str) -> str:
+        """Get content type for a (lowercase) file extension."""
+        return _CONTENT_TYPE_MAP.get(ext, "audio/wav")
 
     async def transcribe_file(
         self,
         audio_file_path: str,
         language: str = "nl",
         on_progress: Callable[[str], None] | None = None,
-        phrase_list: list[str] | None = None,
+        phrase_list: Sequence[str] | None = None,
     ) -> SpeechTranscriptionResult:
         """
         Transcribe an audio file with speaker diarization using Azure Speech Fast Transcription API.
@@ -198,7 +301,10 @@ class AzureSpeechTranscriber:
             language=language,
         )
 
-        if not os.path.exists(audio_file_path):
+        # One stat for both the existence and the size check
+        try:
+            file_size = os.stat(audio_file_path).st_size
+        except OSError:
             result.status = "error"
             result.error = f"Audio file not found: {audio_file_path}"
             logger.warning(
@@ -210,6 +316,9 @@ class AzureSpeechTranscriber:
         # Track if we created a converted/extracted file that needs cleanup
         converted_file_path: str | None = None
         file_to_transcribe = audio_file_path
+        # ffmpeg process streaming converted audio straight into the upload
+        conversion: asyncio.subprocess.Process | None = None
+        conversion_stderr: asyncio.Task[bytes] | None = None
 
         try:
             logger.info(
@@ -222,14 +331,16 @@ class AzureSpeechTranscriber:
             )
 
             # Check file size (300MB limit for Fast Transcription)
-            file_size_mb = os.path.getsize(audio_file_path) / (1024 * 1024)
+            file_size_mb = file_size / (1024 * 1024)
             if file_size_mb > 300:
                 result.status = "error"
                 result.error = f"File size ({file_size_mb:.1f}MB) exceeds 300MB limit for Fast Transcription"
                 return result
 
+            action, upload_ext = _route_file(audio_file_path)
+
             # Check if we need to extract audio from container (ASF -> WMA, no quality loss)
-            if _needs_extraction_for_speech(audio_file_path):
+            if action == "extract":
                 if on_progress:
                     on_progress("Extracting audio from container (no re-encoding)...")
 
@@ -241,18 +352,20 @@ class AzureSpeechTranscriber:
                     )
                     return result
 
-                converted_file_path = audio_file_path.rsplit(".", 1)[0] + "_extracted.wma"
+                source = Path(audio_file_path)
+                converted_file_path = str(source.with_name(f"{source.stem}_extracted.wma"))
                 logger.info(
                     "Extracting audio from ASF container (no re-encoding, preserves quality)",
                     extra={"audio_filename": result.filename, "output_path": converted_file_path},
                 )
-                extract_audio_from_container(audio_file_path, converted_file_path)
+                await extract_audio_from_container_async(audio_file_path, converted_file_path)
                 file_to_transcribe = converted_file_path
+                upload_ext = ".wma"
 
                 logger.info("Extraction complete", extra={"audio_filename": result.filename})
 
             # Check if we need full conversion (re-encoding)
-            elif _needs_conversion_for_speech(audio_file_path):
+            elif action == "convert":
                 if on_progress:
                     on_progress("Converting audio format...")
 
@@ -264,15 +377,17 @@ class AzureSpeechTranscriber:
                     )
                     return result
 
-                converted_file_path = audio_file_path.rsplit(".", 1)[0] + "_speech_converted.wav"
+                # Stream ffmpeg's Ogg/Opus output directly into the upload (no temp
+                # file); Opus is far smaller than PCM WAV, so the upload is faster
+                source = Path(audio_file_path)
+                file_to_transcribe = str(source.with_name(f"{source.stem}_speech_converted.ogg"))
+                upload_ext = ".ogg"
                 logger.info(
-                    "Converting audio for Azure Speech (re-encoding)",
-                    extra={"audio_filename": result.filename, "output_path": converted_file_path},
+                    "Converting audio for Azure Speech (re-encoding, streamed)",
+                    extra={"audio_filename": result.filename},
                 )
-                convert_to_wav(audio_file_path, converted_file_path)
-                file_to_transcribe = converted_file_path
-
-                logger.info("Conversion complete", extra={"audio_filename": result.filename})
+                conversion = await convert_to_ogg_opus_stream(audio_file_path)
+                conversion_stderr = asyncio.create_task(conversion.stderr.read())
 
             if on_progress:
                 on_progress("Uploading to Azure Speech Fast Transcription...")
@@ -297,51 +412,69 @@ class AzureSpeechTranscriber:
 
             # Add phrase list if provided (improves recognition of domain-specific terms)
             if phrase_list:
-                definition["phraseList"] = {"phrases": phrase_list}
+                definition["phraseList"] = {"phrases": list(phrase_list)}
                 logger.info(
                     "Using phrase list for improved recognition",
                     extra={
                         "audio_filename": result.filename,
                         "phrase_count": len(phrase_list),
-                        "phrases_sample": phrase_list[:5],
                     },
                 )
 
+            # Serialized once; reused for logging and the request body
+            definition_json = json.dumps(definition, separators=(",", ":"))
+
             logger.info(
                 "Calling Azure Speech Fast Transcription API",
                 extra={
                     "audio_filename": result.filename,
                     "locale": locale,
                     "endpoint": endpoint,
-                    "definition": json.dumps(definition),
                     "file_size_mb": round(file_size_mb, 2),
                 },
             )
+            # The definition includes the full phrase list, so only log it at DEBUG
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Fast Transcription definition",
+                    extra={"audio_filename": result.filename, "definition": definition_json},
+                )
 
             if on_progress:
                 on_progress("Transcribing audio (this may take a few minutes)...")
 
             # Make the API request
-            content_type = self._get_content_type(file_to_transcribe)
+            content_type = self._get_content_type(upload_ext)
             
-            async with httpx.AsyncClient(timeout=httpx.Timeout(600.0)) as client:
-                with open(file_to_transcribe, "rb") as audio_file:
-                    files = {
-                        "audio": (os.path.basename(file_to_transcribe), audio_file, content_type),
-                    }
-                    data = {
-                        "definition": json.dumps(definition),
-                    }
-                    headers = {
-                        "Ocp-Apim-Subscription-Key": self.settings.azure_speech_key,
-                    }
-
-                    response = await client.post(
-                        endpoint,
-                        files=files,
-                        data=data,
-                        headers=headers,
-                    )
+            headers = {
+                "Ocp-Apim-Subscription-Key": self.settings.azure_speech_key,
+            }
+            
+            # Both converted (ffmpeg stdout) and on-disk audio are streamed in
+            # chunks, so the event loop never blocks on a large read
+            if conversion is not None:
+                audio = _iter_stream(
+                    conversion.stdout,
+                    asyncio.get_running_loop().time() + FFMPEG_CONVERSION_TIMEOUT,
+                )
+            else:
+                audio = _iter_file(file_to_transcribe)
+
+            boundary = uuid.uuid4().hex
+            response = await self._get_client().post(
+                endpoint,
+                content=_multipart_body(
+                    boundary,
+                    definition_json,
+                    os.path.basename(file_to_transcribe),
+                    content_type,
+                    audio,
+                ),
+                headers={
+                    **headers,
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                },
+            )
 
             logger.info(
                 "Received Azure Speech response",
@@ -351,6 +484,13 @@ class AzureSpeechTranscriber:
                 },
             )
 
+            # Once ffmpeg's output was fully sent, a failed conversion is the
+            # real error (Azure only saw truncated audio). If Azure answered
+            # before reading it all, ffmpeg is stopped in the finally block.
+            if conversion is not None and conversion.stdout.at_eof():
+                await _check_conversion(conversion, conversion_stderr)
+                logger.info("Conversion complete", extra={"audio_filename": result.filename})
+
             if response.status_code != 200:
                 error_text = response.text
                 result.status = "error"
@@ -368,84 +508,82 @@ class AzureSpeechTranscriber:
             if on_progress:
                 on_progress("Processing transcription results...")
 
-            # Parse the response
-            response_data = response.json()
-
-            # Log the full response for debugging
-            logger.info(
-                "Azure Speech API response structure",
-                extra={
-                    "audio_filename": result.filename,
-                    "has_combinedPhrases": "combinedPhrases" in response_data,
-                    "has_phrases": "phrases" in response_data,
-                    "phrases_count": len(response_data.get("phrases", [])),
-                    "first_phrase_has_speaker": (
-                        response_data.get("phrases", [{}])[0].get("speaker") is not None
-                        if response_data.get("phrases") else False
-                    ),
-                    "response_keys": list(response_data.keys()),
-                },
-            )
+            # Parse the response (orjson parses the raw bytes, no text decode)
+            response_data = orjson.loads(response.content)
+            phrases = response_data.get("phrases", [])
 
-            # Log first few phrases to see speaker data
-            for i, phrase in enumerate(response_data.get("phrases", [])[:3]):
-                logger.info(
-                    f"Phrase {i} sample",
+            # Response structure and sample phrases are only useful when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Azure Speech API response structure",
                     extra={
                         "audio_filename": result.filename,
-                        "phrase_keys": list(phrase.keys()),
-                        "speaker": phrase.get("speaker"),
-                        "text": phrase.get("text", "")[:50],
+                        "has_combinedPhrases": "combinedPhrases" in response_data,
+                        "has_phrases": "phrases" in response_data,
+                        "phrases_count": len(phrases),
+                        "first_phrase_has_speaker": (
+                            bool(phrases) and phrases[0].get("speaker") is not None
+                        ),
+                        "response_keys": list(response_data.keys()),
                     },
                 )
 
+                for i, phrase in enumerate(phrases[:3]):
+                    logger.debug(
+                        f"Phrase {i} sample",
+                        extra={
+                            "audio_filename": result.filename,
+                            "phrase_keys": list(phrase.keys()),
+                            "speaker": phrase.get("speaker"),
+                            "text": phrase.get("text", "")[:50],
+                        },
+                    )
+
             # Extract duration
             duration_ms = response_data.get("durationMilliseconds", 0)
             result.duration_seconds = duration_ms / 1000.0
 
-            # Extract combined text
-            combined_phrases = response_data.get("combinedPhrases", [])
-            if combined_phrases:
-                result.full_text = " ".join(cp.get("text", "") for cp in combined_phrases)
+            # Extract phrases with speaker info.
+            # Local aliases: this loop runs once per phrase of a long recording
+            append_segment = result.segments.append
+            segment_cls = SpeechSegment
+            # Full text is collected in the same pass over the phrases
+            text_parts: list[str] = []
+            append_text = text_parts.append
 
-            # Extract phrases with speaker info
-            phrases = response_data.get("phrases", [])
-            
             for phrase in phrases:
-                text = phrase.get("text", "").strip()
+                get = phrase.get
+                text = get("text", "").strip()
                 if not text:
                     continue
+                append_text(text)
 
                 # Get timing
-                offset_ms = phrase.get("offsetMilliseconds", 0)
-                duration_phrase_ms = phrase.get("durationMilliseconds", 0)
-                start_time = offset_ms / 1000.0
-                end_time = (offset_ms + duration_phrase_ms) / 1000.0
+                offset_ms = get("offsetMilliseconds", 0)
+                duration_phrase_ms = get("durationMilliseconds", 0)
 
                 # Get speaker (if diarization is enabled)
-                speaker = phrase.get("speaker")
+                speaker = get("speaker")
                 if speaker is not None:
                     speaker_id = f"Speaker {speaker + 1}"  # 0-indexed to 1-indexed
                 else:
                     speaker_id = "Speaker"
 
-                segment = SpeechSegment(
-                    speaker_id=speaker_id,
-                    text=text,
-                    start_time=start_time,
-                    end_time=end_time,
-                )
-                result.segments.append(segment)
-
-            # If no segments but we have full text, create a single segment
-            if not result.segments and result.full_text:
-                result.segments.append(SpeechSegment(
-                    speaker_id="Speaker 1",
-                    text=result.full_text,
-                    start_time=0.0,
-                    end_time=result.duration_seconds,
+                append_segment(segment_cls(
+                    speaker_id,
+                    text,
+                    offset_ms / 1000.0,
+                    (offset_ms + duration_phrase_ms) / 1000.0,
                 ))
 
+            if text_parts:
+                result.full_text = " ".join(text_parts)
+            else:
+                # Fall back to the combined text when there are no usable phrases
+                combined_phrases = response_data.get("combinedPhrases", [])
+                if combined_phrases:
+                    result.full_text = " ".join(cp.get("text", "") for cp in combined_phrases)
+
             result.status = "completed"
 
             logger.info(
@@ -481,27 +619,40 @@ class AzureSpeechTranscriber:
             )
 
         finally:
+            # Stop ffmpeg if the upload ended early
+            if conversion is not None:
+                await _stop_conversion(conversion, conversion_stderr)
+
             # Clean up converted file if we created one
-            if converted_file_path and os.path.exists(converted_file_path):
-                try:
+            if converted_file_path:
+                # A single remove; a missing file or other cleanup error is ignored
+                with suppress(OSError):
                     os.remove(converted_file_path)
                     logger.info(
                         "Cleaned up converted file",
                         extra={"audio_filename": result.filename, "converted_file_path": converted_file_path},
                     )
-                except OSError:
-                    pass
 
         return result
 
 
-# Singleton instance
 _speech_transcriber: AzureSpeechTranscriber | None = None
+_speech_transcriber_lock = threading.Lock()
 
 
 def get_speech_transcriber() -> AzureSpeechTranscriber:
-    """Get singleton Azure Speech transcriber instance."""
+    """Get singleton Azure Speech transcriber instance (safe to call from worker threads)."""
     global _speech_transcriber
     if _speech_transcriber is None:
-        _speech_transcriber = AzureSpeechTranscriber()
+        with _speech_transcriber_lock:
+            if _speech_transcriber is None:
+                _speech_transcriber = AzureSpeechTranscriber()
     return _speech_transcriber
+
+
+async def close_speech_transcriber() -> None:
+    """Close the singleton transcriber's HTTP client, if it was ever created."""
+    global _speech_transcriber
+    transcriber, _speech_transcriber = _speech_transcriber, None
+    if transcriber is not None:
+        await transcriber.aclose()
@@ -2,16 +2,93 @@
 Export service for generating Word and PDF documents from transcriptions.
 """
 import io
+from collections.abc import Callable, Iterator
 from datetime import datetime
+from functools import lru_cache
+from tempfile import SpooledTemporaryFile
+from typing import IO, NamedTuple
+from xml.sax.saxutils import escape
 from docx import Document
 from docx.shared import Pt, Inches
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.platypus import HRFlowable, SimpleDocTemplate, Paragraph
 
 from app.services.speech_service import TranscriptionResult
+from app.services.transcript import group_by_speaker
+
+# Exports larger than this are spooled to disk instead of held in memory
+SPOOL_MAX_SIZE = 1 << 20  # 1 MiB
+
+# Chunk size used when streaming exports to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Separator line for Word exports (PDF exports draw a rule instead)
+WORD_SEPARATOR = "_" * 50
+
+
+class _PdfStyles(NamedTuple):
+    normal: ParagraphStyle
+    heading: ParagraphStyle
+    title: ParagraphStyle
+    speaker: ParagraphStyle
+    meta: ParagraphStyle
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles() -> _PdfStyles:
+    """Build the PDF paragraph styles once; they are only read during builds."""
+    styles = getSampleStyleSheet()
+    
+    # Vertical spacing lives on the styles, so the story needs no Spacers
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=50,
+        alignment=1  # Center
+    )
+    
+    heading_style = ParagraphStyle(
+        'ContentHeading',
+        parent=styles['Heading2'],
+        spaceAfter=styles['Heading2'].spaceAfter + 15,
+    )
+    
+    speaker_style = ParagraphStyle(
+        'Speaker',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    meta_style = ParagraphStyle(
+        'Meta',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor='#666666'
+    )
+    
+    return _PdfStyles(
+        normal=styles['Normal'],
+        heading=heading_style,
+        title=title_style,
+        speaker=speaker_style,
+        meta=meta_style,
+    )
+
+
+def _stream_document(write: Callable[[IO[bytes]], None]) -> Iterator[bytes]:
+    """Render a document into a spooled temp file and yield it in chunks."""
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        write(spool)
+        spool.seek(0)
+        while chunk := spool.read(EXPORT_CHUNK_SIZE):
+            yield chunk
 
 
 class ExportService:
@@ -28,6 +105,33 @@ class ExportService:
         Returns:
             BytesIO buffer containing the Word document
         """
+        buffer = io.BytesIO()
+        ExportService.write_word_document(result, buffer)
+        buffer.seek(0)
+        return buffer
+    
+    @staticmethod
+    def stream_word_document(result: TranscriptionResult) -> Iterator[bytes]:
+        """
+        Stream a Word document in chunks without buffering it all in memory.
+        
+        Args:
+            result: The transcription result to export
+            
+        Yields:
+            Chunks of the Word document
+        """
+        return _stream_document(lambda out: ExportService.write_word_document(result, out))
+    
+    @staticmethod
+    def write_word_document(result: TranscriptionResult, out: IO[bytes]) -> None:
+        """
+        Write a Word document for a transcription result to a binary stream.
+        
+        Args:
+            result: The transcription result to export
+            out: Writable, seekable binary stream
+        """
         doc = Document()
         
         # Add title
@@ -46,52 +150,38 @@ class ExportService:
         
         meta_para = doc.add_paragraph()
         meta_para.add_run("Taal: ").bold = True
-        meta_para.add_run(result.locale)
+        meta_para.add_run(result.language)
         
         doc.add_paragraph()
-        doc.add_paragraph("_" * 50)
+        doc.add_paragraph(WORD_SEPARATOR)
         doc.add_paragraph()
         
         # Add transcription content
         doc.add_heading("Inhoud", level=1)
         
-        current_speaker = None
-        current_text = []
-        
-        for segment in result.segments:
-            if segment.speaker_id != current_speaker:
-                # Write previous speaker's content
-                if current_text and current_speaker:
-                    para = doc.add_paragraph()
-                    speaker_run = para.add_run(f"{current_speaker}: ")
-                    speaker_run.bold = True
-                    para.add_run(" ".join(current_text))
-                    doc.add_paragraph()
-                
-                current_speaker = segment.speaker_id
-                current_text = [segment.text]
-            else:
-                current_text.append(segment.text)
-        
-        # Write last speaker's content
-        if current_text and current_speaker:
-            para = doc.add_paragraph()
-            speaker_run = para.add_run(f"{current_speaker}: ")
+        # Speaker turns are spaced by their style instead of blank paragraphs
+        speaker_style = doc.styles.add_style("Speaker", WD_STYLE_TYPE.PARAGRAPH)
+        speaker_style.base_style = doc.styles["Normal"]
+        speaker_style.paragraph_format.space_after = Pt(12)
+        
+        for speaker, text in group_by_speaker(result.segments):
+            if not speaker:
+                continue
+            para = doc.add_paragraph(style=speaker_style)
+            speaker_run = para.add_run(f"{speaker}: ")
             speaker_run.bold = True
-            para.add_run(" ".join(current_text))
+            para.add_run(text)
+        if not result.segments and result.full_text:
+            # Results without segments only have the plain transcript
+            doc.add_paragraph(result.full_text, style=speaker_style)
         
         # Add footer
         doc.add_paragraph()
-        doc.add_paragraph("_" * 50)
+        doc.add_paragraph(WORD_SEPARATOR)
         footer = doc.add_paragraph()
         footer.add_run("Generated by Transcribe App").italic = True
         
-        # Save to buffer
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        
-        return buffer
+        doc.save(out)
     
     @staticmethod
     def create_pdf_document(result: TranscriptionResult) -> io.BytesIO:
@@ -105,10 +195,35 @@ class ExportService:
             BytesIO buffer containing the PDF document
         """
         buffer = io.BytesIO()
+        ExportService.write_pdf_document(result, buffer)
+        buffer.seek(0)
+        return buffer
+    
+    @staticmethod
+    def stream_pdf_document(result: TranscriptionResult) -> Iterator[bytes]:
+        """
+        Stream a PDF document in chunks without buffering it all in memory.
         
+        Args:
+            result: The transcription result to export
+            
+        Yields:
+            Chunks of the PDF document
+        """
+        return _stream_document(lambda out: ExportService.write_pdf_document(result, out))
+    
+    @staticmethod
+    def write_pdf_document(result: TranscriptionResult, out: IO[bytes]) -> None:
+        """
+        Write a PDF document for a transcription result to a binary stream.
+        
+        Args:
+            result: The transcription result to export
+            out: Writable binary stream
+        """
         # Create PDF document
         doc = SimpleDocTemplate(
-            buffer,
+            out,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -116,87 +231,43 @@ class ExportService:
             bottomMargin=2*cm
         )
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        
-        speaker_style = ParagraphStyle(
-            'Speaker',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        meta_style = ParagraphStyle(
-            'Meta',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor='#666666'
-        )
+        styles = _pdf_styles()
+        meta_style = styles.meta
         
         # Build content
         story = []
         
         # Title
-        story.append(Paragraph("Transcriptie", title_style))
-        story.append(Spacer(1, 20))
+        story.append(Paragraph("Transcriptie", styles.title))
         
         # Metadata
-        story.append(Paragraph(f"<b>Bestand:</b> {result.filename}", meta_style))
+        # User-provided strings are escaped for reportlab's markup parser
+        story.append(Paragraph(f"<b>Bestand:</b> {escape(result.filename)}", meta_style))
         story.append(Paragraph(
             f"<b>Datum:</b> {result.created_at.strftime('%d-%m-%Y %H:%M')}", 
             meta_style
         ))
-        story.append(Paragraph(f"<b>Taal:</b> {result.locale}", meta_style))
-        story.append(Spacer(1, 30))
+        story.append(Paragraph(f"<b>Taal:</b> {escape(result.language)}", meta_style))
         
         # Separator
-        story.append(Paragraph("_" * 70, styles['Normal']))
-        story.append(Spacer(1, 20))
+        story.append(HRFlowable(width="100%", thickness=0.5, spaceBefore=30, spaceAfter=20))
         
         # Content header
-        story.append(Paragraph("Inhoud", styles['Heading2']))
-        story.append(Spacer(1, 15))
-        
-        # Transcription content
-        current_speaker = None
-        current_text = []
-        
-        for segment in result.segments:
-            if segment.speaker_id != current_speaker:
-                if current_text and current_speaker:
-                    text = " ".join(current_text)
-                    story.append(Paragraph(
-                        f"<b>{current_speaker}:</b> {text}",
-                        speaker_style
-                    ))
-                
-                current_speaker = segment.speaker_id
-                current_text = [segment.text]
-            else:
-                current_text.append(segment.text)
-        
-        # Last speaker's content
-        if current_text and current_speaker:
-            text = " ".join(current_text)
-            story.append(Paragraph(
-                f"<b>{current_speaker}:</b> {text}",
-                speaker_style
-            ))
+        story.append(Paragraph("Inhoud", styles.heading))
+        
+        # Transcription content (one paragraph per speaker turn; locals
+        # keep the lookups out of the loop)
+        append = story.append
+        make_paragraph = Paragraph
+        speaker_style = styles.speaker
+        for speaker, text in group_by_speaker(result.segments):
+            if speaker:
+                append(make_paragraph(f"<b>{escape(speaker)}:</b> {escape(text)}", speaker_style))
+        if not result.segments and result.full_text:
+            append(make_paragraph(escape(result.full_text), speaker_style))
         
         # Footer
-        story.append(Spacer(1, 30))
-        story.append(Paragraph("_" * 70, styles['Normal']))
-        story.append(Spacer(1, 10))
+        story.append(HRFlowable(width="100%", thickness=0.5, spaceBefore=30, spaceAfter=10))
         story.append(Paragraph(
             "<i>Generated by Transcribe App</i>",
             meta_style
@@ -204,6 +275,3 @@ class ExportService:
         
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
-        
-        return buffer
@@ -0,0 +1,71 @@
+"""
+Store for transcription job results.
+
+Results are kept in a bounded in-memory cache with a time-to-live, so finished
+jobs are evicted instead of accumulating for the lifetime of the process.
+Each result is JSON-encoded once when stored, so status polling returns
+ready-made bytes instead of re-serializing every segment.
+"""
+import time
+from collections import OrderedDict
+
+from app.services.azure_speech_service import SpeechTranscriptionResult
+from app.services.speech_service import TranscriptionResult
+
+JobResult = TranscriptionResult | SpeechTranscriptionResult
+
+
+class JobStore:
+    """
+    In-memory job store with LRU eviction and per-entry expiry.
+
+    The interface is async so a shared backend (e.g. Redis) can be swapped in
+    without touching the API handlers. All operations on the in-memory backend
+    complete without awaiting, so no lock is needed on a single event loop.
+
+    Results are snapshotted as JSON on ``put``; call ``put`` again after
+    mutating a stored result.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, JobResult, bytes]] = OrderedDict()
+
+    def _lookup(self, job_id: str) -> tuple[float, JobResult, bytes] | None:
+        entry = self._entries.get(job_id)
+        if entry is None:
+            return None
+
+        if entry[0] <= time.monotonic():
+            del self._entries[job_id]
+            return None
+
+        self._entries.move_to_end(job_id)
+        return entry
+
+    async def get(self, job_id: str) -> JobResult | None:
+        """Get a job result, or None if unknown or expired."""
+        entry = self._lookup(job_id)
+        return entry[1] if entry is not None else None
+
+    async def get_json(self, job_id: str) -> bytes | None:
+        """Get the JSON-encoded job result, or None if unknown or expired."""
+        entry = self._lookup(job_id)
+        return entry[2] if entry is not None else None
+
+    async def put(self, job_id: str, result: JobResult) -> None:
+        """Store (or replace) a job result and reset its expiry."""
+        encoded = result.to_json()
+        self._entries[job_id] = (time.monotonic() + self.ttl_seconds, result, encoded)
+        self._entries.move_to_end(job_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, job_id: str) -> bool:
+        """Delete a job result. Returns False if it did not exist."""
+        entry = self._entries.pop(job_id, None)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,166 @@
+"""
+Cache of finished transcriptions keyed by audio content.
+
+Uploading the same recording again (same bytes, engine, language and model)
+returns the earlier result instead of converting and transcribing it again.
+Entries are kept in memory as JSON and, when a directory is configured, also
+written to ``<key>.json`` there so they survive restarts. The directory is
+held to the same entry limit and TTL as the memory cache.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import orjson
+
+from app.services.azure_speech_service import SpeechTranscriptionResult
+from app.services.job_store import JobResult
+from app.services.speech_service import TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+# Result classes by name, so a cached result comes back as the type it was stored as
+_RESULT_TYPES: dict[str, type[JobResult]] = {
+    cls.__name__: cls for cls in (TranscriptionResult, SpeechTranscriptionResult)
+}
+
+
+def cache_key(digest: str, *parts: str) -> str:
+    """Combine an audio digest with the settings that affect the transcript."""
+    return hashlib.sha256("\0".join((digest, *parts)).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-keyed result cache with LRU eviction and per-entry expiry.
+
+    Results are snapshotted as JSON on ``put``, and every ``get`` returns a new
+    result of the stored type, so callers can modify what they get back.
+
+    Jobs are linked to the key of their upload, so deleting the last job
+    that shares a transcription also drops it from the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 86400.0,
+        directory: str | None = None,
+        max_jobs: int = 1000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory) if directory else None
+        self.max_jobs = max_jobs
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._job_keys: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, key: str) -> JobResult | None:
+        """Get a copy of a cached result, or None if unknown or expired."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            encoded = entry[1]
+        elif self.directory is not None:
+            loaded = await asyncio.to_thread(self._read, key)
+            if loaded is None:
+                return None
+            remaining, encoded = loaded
+            self._remember(key, encoded, remaining)
+        else:
+            return None
+
+        data = orjson.loads(encoded)
+        return _RESULT_TYPES[data["type"]].from_dict(data["result"])
+
+    async def put(self, key: str, result: JobResult) -> None:
+        """Cache a finished result and reset its expiry."""
+        encoded = orjson.dumps({"type": type(result).__name__, "result": result.to_dict()})
+        self._remember(key, encoded, self.ttl_seconds)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write, key, encoded)
+
+    async def delete(self, key: str) -> None:
+        """Drop a cached result from memory and disk."""
+        self._entries.pop(key, None)
+        if self.directory is not None:
+            await asyncio.to_thread(self._remove, self.directory / f"{key}.json")
+
+    def link_job(self, job_id: str, key: str) -> None:
+        """Remember which cache key a job's transcription belongs to."""
+        self._job_keys[job_id] = key
+        self._job_keys.move_to_end(job_id)
+        while len(self._job_keys) > self.max_jobs:
+            self._job_keys.popitem(last=False)
+
+    async def delete_job(self, job_id: str) -> None:
+        """Drop the cached result a job was linked to, unless other jobs still share it."""
+        key = self._job_keys.pop(job_id, None)
+        if key is not None and key not in self._job_keys.values():
+            await self.delete(key)
+
+    def _remember(self, key: str, encoded: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, encoded)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> tuple[float, bytes] | None:
+        """Load a persisted entry, returning (seconds left, JSON) if still fresh."""
+        path = self.directory / f"{key}.json"
+        try:
+            remaining = self.ttl_seconds - (time.time() - path.stat().st_mtime)
+            if remaining <= 0:
+                self._remove(path)
+                return None
+            return remaining, path.read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, key: str, encoded: bytes) -> None:
+        """Persist an entry atomically, then prune the directory."""
+        path = self.directory / f"{key}.json"
+        tmp_path = path.with_name(f".{path.name}.part")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(encoded)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Failures only cost the cross-restart reuse
+            self._remove(tmp_path)
+            logger.warning("Could not persist cached result", extra={"path": str(path)}, exc_info=True)
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired files, then the oldest ones beyond max_entries."""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        cutoff = time.time() - self.ttl_seconds
+        excess = len(files) - self.max_entries
+        for index, (mtime, path) in enumerate(files):
+            if index < excess or mtime <= cutoff:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,26 +2,58 @@
 Azure OpenAI transcription service using gpt-4o-transcribe-diarize model.
 This model provides speech-to-text with built-in speaker diarization.
 """
+import asyncio
 import os
 import logging
+import threading
+from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable
-from openai import AzureOpenAI
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import BinaryIO, Callable
+import aiofiles
+from openai import AsyncAzureOpenAI
 from openai import BadRequestError
 
 from app.config import get_settings
 from app.services.audio_converter import (
     needs_conversion,
     convert_to_wav,
+    estimate_wav_size,
     is_ffmpeg_available,
+    split_at_silence,
 )
+from app.services.transcript import TranscriptResultMixin
 
 
 logger = logging.getLogger(__name__)
 
+# Upload limit of gpt-4o-transcribe-diarize; longer recordings are split
+MAX_UPLOAD_MB = 25
 
-@dataclass
+# Cap on transcription requests in flight at once, across all jobs. Each
+# request holds its audio in memory until the response arrives, so uploads
+# read from disk take at most MAX_CONCURRENT_REQUESTS * MAX_UPLOAD_MB (250MB).
+MAX_CONCURRENT_REQUESTS = 10
+
+# Segment attributes that may carry the diarization speaker label
+_SPEAKER_ATTRS: tuple[str, ...] = ("speaker", "speaker_id", "speakerId", "speaker_label", "speakerLabel")
+
+# Upload content type per natively supported extension
+_CONTENT_TYPE_MAP: Mapping[str, str] = MappingProxyType({
+    ".mp3": "audio/mpeg",
+    ".mp4": "audio/mp4",
+    ".m4a": "audio/mp4",
+    ".wav": "audio/wav",
+    ".webm": "audio/webm",
+    ".mpeg": "audio/mpeg",
+    ".mpga": "audio/mpeg",
+})
+
+
+@dataclass(slots=True)
 class TranscriptionSegment:
     """Represents a segment of transcribed speech."""
     speaker_id: str
@@ -30,9 +62,11 @@ class TranscriptionSegment:
     end_time: float = 0.0
 
 
-@dataclass
-class TranscriptionResult:
+@dataclass(slots=True)
+class TranscriptionResult(TranscriptResultMixin):
     """Complete transcription result with all segments."""
+    segment_type = TranscriptionSegment
+
     segments: list[TranscriptionSegment] = field(default_factory=list)
     full_text: str = ""
     status: str = "pending"
@@ -41,47 +75,10 @@ class TranscriptionResult:
     created_at: datetime = field(default_factory=datetime.now)
     language: str = "nl"
     duration_seconds: float = 0.0
-    
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "segments": [
-                {
-                    "speaker_id": s.speaker_id,
-                    "text": s.text,
-                    "start_time": s.start_time,
-                    "end_time": s.end_time,
-                }
-                for s in self.segments
-            ],
-            "full_text": self.full_text,
-            "status": self.status,
-            "error": self.error,
-            "filename": self.filename,
-            "created_at": self.created_at.isoformat(),
-            "language": self.language,
-            "duration_seconds": self.duration_seconds,
-        }
-    
-    def get_formatted_transcript(self) -> str:
-        """Get formatted transcript with speaker labels."""
-        lines = []
-        current_speaker = None
-        current_text = []
-        
-        for segment in self.segments:
-            if segment.speaker_id != current_speaker:
-                if current_text:
-                    lines.append(f"{current_speaker}: {' '.join(current_text)}")
-                current_speaker = segment.speaker_id
-                current_text = [segment.text]
-            else:
-                current_text.append(segment.text)
-        
-        if current_text:
-            lines.append(f"{current_speaker}: {' '.join(current_text)}")
-        
-        return "\n\n".join(lines)
+    # Serialized segments, reused until the segment list is replaced or resized
+    _segments_cache: tuple[list[TranscriptionSegment], int, list[dict]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
 class SpeechTranscriber:
@@ -94,6 +91,8 @@ class SpeechTranscriber:
         self.settings = get_settings()
         self._validate_settings()
         self.client = self._create_client()
+        self._resolve_request_options()
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
     
     def _validate_settings(self):
         """Validate that required settings are present."""
@@ -108,22 +107,30 @@ class SpeechTranscriber:
                 "Please configure it in your .env file."
             )
     
-    def _create_client(self) -> AzureOpenAI:
-        """Create Azure OpenAI client."""
-        return AzureOpenAI(
+    def _create_client(self) -> AsyncAzureOpenAI:
+        """Create the async Azure OpenAI client."""
+        return AsyncAzureOpenAI(
             api_key=self.settings.azure_openai_api_key,
             api_version=self.settings.azure_openai_api_version,
-            azure_endpoint=self.settings.azure_openai_endpoint
+            azure_endpoint=self.settings.azure_openai_endpoint,
+            # The SDK retries 408/409/429/5xx and connection errors itself,
+            # with exponential backoff and jitter (honouring Retry-After)
+            max_retries=self.settings.azure_openai_max_retries,
         )
 
-    def _get_segment_speaker_label(self, segment) -> str | None:
-        """Best-effort extraction of a diarization speaker label from a segment."""
-        for attr in ["speaker", "speaker_id", "speakerId", "speaker_label", "speakerLabel"]:
-            if hasattr(segment, attr):
-                value = getattr(segment, attr)
-                if value is not None:
-                    return str(value)
-        return None
+    def _resolve_request_options(self) -> None:
+        """Work out the response format and chunking strategy once from settings."""
+        self._response_format = (self.settings.azure_openai_transcription_response_format or "json").strip()
+
+        # Diarization deployments require chunking_strategy. If not explicitly configured,
+        # default to 'auto' when the deployment name suggests a diarization model.
+        configured_chunking = (self.settings.azure_openai_chunking_strategy_type or "").strip() or None
+        inferred_chunking = None
+        if not configured_chunking and "diarize" in (self.settings.azure_openai_deployment_name or "").lower():
+            inferred_chunking = "auto"
+
+        self._chunking_strategy = configured_chunking or inferred_chunking
+        self._chunking_inferred = inferred_chunking is not None
 
     def _summarize_response_for_logs(self, response) -> dict:
         """Return a small, safe summary for logging (no transcript text)."""
@@ -155,7 +162,7 @@ class SpeechTranscriber:
                 seg0 = segments[0]
                 speaker_fields = [
                     name
-                    for name in ("speaker", "speaker_id", "speakerId", "speaker_label", "speakerLabel")
+                    for name in _SPEAKER_ATTRS
                     if hasattr(seg0, name)
                 ]
                 summary["segment0_speaker_fields"] = speaker_fields
@@ -166,38 +173,50 @@ class SpeechTranscriber:
     
     async def transcribe_file(
         self,
-        audio_file_path: str,
+        audio_file_path: str | BinaryIO,
         language: str = "nl",
-        on_progress: Callable[[str], None] | None = None
+        on_progress: Callable[[str], None] | None = None,
+        filename: str | None = None,
     ) -> TranscriptionResult:
         """
         Transcribe an audio file with speaker diarization using gpt-4o-transcribe-diarize.
         
         Args:
-            audio_file_path: Path to the audio file (max 25MB)
+            audio_file_path: Path to the audio file (max 25MB), or an in-memory
+                             binary file object in a natively supported format
             language: Language code (e.g., 'nl' for Dutch, 'en' for English)
             on_progress: Optional callback for progress updates
+            filename: Name of the audio when passing a file object; the
+                      extension tells Azure which format it is
             
         Returns:
             TranscriptionResult with segments and speaker information
         """
+        in_memory = not isinstance(audio_file_path, str)
         result = TranscriptionResult(
-            filename=os.path.basename(audio_file_path),
+            filename=filename or ("audio" if in_memory else os.path.basename(audio_file_path)),
             language=language
         )
         
-        if not os.path.exists(audio_file_path):
-            result.status = "error"
-            result.error = f"Audio file not found: {audio_file_path}"
-            logger.warning(
-                "Audio file missing",
+        # Stat off the event loop; the size is reused below unless we convert
+        file_size = 0
+        if not in_memory:
+            try:
+                file_size = (await asyncio.to_thread(os.stat, audio_file_path)).st_size
+            except OSError:
+                result.status = "error"
+                result.error = f"Audio file not found: {audio_file_path}"
+                logger.warning(
+                    "Audio file missing",
                     extra={"path": audio_file_path, "audio_filename": result.filename},
-            )
-            return result
+                )
+                return result
         
-        # Track if we created a converted file that needs cleanup
+        # Track if we created a converted file or chunks that need cleanup
         converted_file_path: str | None = None
+        chunks: list[tuple[float, str]] = []
         file_to_transcribe = audio_file_path
+        split_source = False
         
         try:
             logger.info(
@@ -211,13 +230,18 @@ class SpeechTranscriber:
             )
 
             # Check if file needs conversion (ASF, WMA, etc.)
-            conversion_needed = needs_conversion(audio_file_path)
+            conversion_needed = needs_conversion(result.filename)
             logger.info(
                 "Checked conversion requirement",
                 extra={"audio_filename": result.filename, "needs_conversion": conversion_needed},
             )
 
             if conversion_needed:
+                if in_memory:
+                    result.status = "error"
+                    result.error = "In-memory audio must be in a natively supported format"
+                    return result
+                
                 if on_progress:
                     on_progress("Converting audio format to WAV...")
                 
@@ -235,33 +259,79 @@ class SpeechTranscriber:
                     )
                     return result
                 
-                # Convert to WAV
-                converted_file_path = audio_file_path.rsplit(".", 1)[0] + "_converted.wav"
+                # A recording whose WAV would exceed the upload limit is split
+                # straight from the source below, skipping a full conversion pass
+                estimated_size = await asyncio.to_thread(estimate_wav_size, audio_file_path)
+                split_source = estimated_size is not None and estimated_size > MAX_UPLOAD_MB * 1024 * 1024
                 logger.info(
-                    "Starting conversion to WAV",
-                    extra={"audio_filename": result.filename, "output_path": converted_file_path},
+                    "Estimated converted size",
+                    extra={"audio_filename": result.filename, "estimated_bytes": estimated_size},
                 )
-                convert_to_wav(audio_file_path, converted_file_path)
-                file_to_transcribe = converted_file_path
+                
+                if not split_source:
+                    # Convert to WAV
+                    # Written next to the upload, so it shares its (possibly tmpfs) filesystem
+                    source = Path(audio_file_path)
+                    converted_file_path = str(source.with_name(f"{source.stem}_converted.wav"))
+                    logger.info(
+                        "Starting conversion to WAV",
+                        extra={"audio_filename": result.filename, "output_path": converted_file_path},
+                    )
+                    # ffmpeg blocks until done, so run it in a worker thread
+                    # (progress callbacks are then invoked from that thread),
+                    # and set up the connection to Azure in the meantime. The
+                    # conversion never waits for that: a prewarm still running
+                    # when it finishes is dropped.
+                    prewarm = asyncio.create_task(self._prewarm_connection())
+                    try:
+                        await asyncio.to_thread(
+                            convert_to_wav,
+                            audio_file_path,
+                            converted_file_path,
+                            on_progress=(
+                                (lambda percent: on_progress(f"Converting audio format to WAV... {percent:.0f}%"))
+                                if on_progress
+                                else None
+                            ),
+                        )
+                    finally:
+                        prewarm.cancel()
+                    file_to_transcribe = converted_file_path
+                    file_size = (await asyncio.to_thread(os.stat, converted_file_path)).st_size
 
-                logger.info(
-                    "Conversion complete",
-                    extra={"audio_filename": result.filename, "file_to_transcribe": file_to_transcribe},
-                )
+                    logger.info(
+                        "Conversion complete",
+                        extra={"audio_filename": result.filename, "file_to_transcribe": file_to_transcribe},
+                    )
                 
-                if on_progress:
-                    on_progress("Conversion complete, starting transcription...")
+                    if on_progress:
+                        on_progress("Conversion complete, starting transcription...")
+            
             
             # Check file size (25MB limit for gpt-4o-transcribe-diarize)
-            file_size_mb = os.path.getsize(file_to_transcribe) / (1024 * 1024)
+            if in_memory:
+                file_size_mb = file_to_transcribe.seek(0, os.SEEK_END) / (1024 * 1024)
+                file_to_transcribe.seek(0)
+            else:
+                file_size_mb = file_size / (1024 * 1024)
             logger.info(
                 "Checked file size",
                 extra={"audio_filename": result.filename, "file_size_mb": round(file_size_mb, 3)},
             )
-            if file_size_mb > 25:
-                result.status = "error"
-                result.error = f"File size ({file_size_mb:.1f}MB) exceeds 25MB limit for gpt-4o-transcribe-diarize"
-                return result
+            if split_source or file_size_mb > MAX_UPLOAD_MB:
+                if in_memory or not is_ffmpeg_available():
+                    result.status = "error"
+                    result.error = f"File size ({file_size_mb:.1f}MB) exceeds 25MB limit for gpt-4o-transcribe-diarize"
+                    return result
+                
+                # Split at silences and transcribe the pieces concurrently
+                if on_progress:
+                    on_progress("Splitting audio into chunks...")
+                chunks = await asyncio.to_thread(split_at_silence, file_to_transcribe)
+                logger.info(
+                    "Split audio into chunks",
+                    extra={"audio_filename": result.filename, "chunks": len(chunks)},
+                )
             
             if on_progress:
                 on_progress("Starting transcription with gpt-4o-transcribe-diarize...")
@@ -272,78 +342,80 @@ class SpeechTranscriber:
                     "audio_filename": result.filename,
                     "file_size_mb": round(file_size_mb, 3),
                     "converted": converted_file_path is not None,
+                    "chunks": len(chunks),
                 },
             )
             
-            # Open and send file to Azure OpenAI
-            with open(file_to_transcribe, "rb") as audio_file:
-                requested_format = (self.settings.azure_openai_transcription_response_format or "json").strip()
-
-                # Diarization deployments require chunking_strategy. If not explicitly configured,
-                # default to 'auto' when the deployment name suggests a diarization model.
-                configured_chunking = (self.settings.azure_openai_chunking_strategy_type or "").strip() or None
-                inferred_chunking = None
-                if not configured_chunking and "diarize" in (self.settings.azure_openai_deployment_name or "").lower():
-                    inferred_chunking = "auto"
-
-                effective_chunking = configured_chunking or inferred_chunking
-
-                # Build API call parameters.
-                # chunking_strategy must be passed as a direct kwarg (string "auto"), NOT via extra_body.
-                create_kwargs: dict = {
-                    "model": self.settings.azure_openai_deployment_name,
-                    "file": audio_file,
-                    "language": language,
-                    "response_format": requested_format,
-                    "temperature": 0,  # Deterministic output for better quality
-                }
-                if effective_chunking:
-                    create_kwargs["chunking_strategy"] = effective_chunking
+            upload_name = result.filename if in_memory else os.path.basename(file_to_transcribe)
+            # Build API call parameters (the file is added when the request is sent).
+            # chunking_strategy must be passed as a direct kwarg (string "auto"), NOT via extra_body.
+            create_kwargs: dict = {
+                "model": self.settings.azure_openai_deployment_name,
+                "language": language,
+                "response_format": self._response_format,
+                "temperature": 0,  # Deterministic output for better quality
+            }
+            if self._chunking_strategy:
+                create_kwargs["chunking_strategy"] = self._chunking_strategy
 
-                logger.info(
-                    "Calling Azure transcription",
-                    extra={
-                        "deployment": self.settings.azure_openai_deployment_name,
-                        "language": language,
-                        "response_format": create_kwargs.get("response_format"),
-                        "chunking_strategy": effective_chunking,
-                        "temperature": 0,
-                        "chunking_inferred": inferred_chunking is not None and configured_chunking is None,
-                    },
-                )
+            logger.info(
+                "Calling Azure transcription",
+                extra={
+                    "deployment": self.settings.azure_openai_deployment_name,
+                    "language": language,
+                    "response_format": create_kwargs.get("response_format"),
+                    "chunking_strategy": self._chunking_strategy,
+                    "temperature": 0,
+                    "chunking_inferred": self._chunking_inferred,
+                },
+            )
 
+            if chunks:
+                # Each chunk gets its own kwargs, as a retry rewrites response_format.
+                # The task group cancels the other uploads when one fails and
+                # waits for all of them, so no chunk file is removed mid-read.
                 try:
-                    response = self.client.audio.transcriptions.create(**create_kwargs)
-                except BadRequestError as e:
-                    # If the configured response_format is unsupported by the deployed model, retry with json.
-                    message = str(e)
-                    if (
-                        create_kwargs.get("response_format") != "json"
-                        and "response_format" in message
-                        and "not compatible" in message
-                    ):
-                        logger.warning(
-                            "response_format rejected by model; retrying with json",
-                            extra={"requested": create_kwargs.get("response_format")},
+                    async with asyncio.TaskGroup() as group:
+                        tasks = [
+                            group.create_task(
+                                self._transcribe_chunk(chunk_path, dict(create_kwargs), on_progress)
+                            )
+                            for _, chunk_path in chunks
+                        ]
+                except ExceptionGroup as e:
+                    raise e.exceptions[0]
+                responses = [task.result() for task in tasks]
+                offsets = [start for start, _ in chunks]
+            else:
+                async with self._request_semaphore:
+                    responses = [
+                        await self._request_transcription(
+                            file_to_transcribe, upload_name, create_kwargs, on_progress
                         )
-                        if on_progress:
-                            on_progress("Azure rejected response_format; retrying with json...")
-                        create_kwargs["response_format"] = "json"
-                        response = self.client.audio.transcriptions.create(**create_kwargs)
-                    else:
-                        raise
+                    ]
+                offsets = [0.0]
             
             if on_progress:
                 on_progress("Processing transcription response...")
 
-            logger.info(
-                "Received transcription response",
-                extra=self._summarize_response_for_logs(response),
-            )
-            
-            # Parse the response
-            result.full_text = getattr(response, "text", "") or ""
-            result.duration_seconds = float(getattr(response, "duration", 0.0) or 0.0)
+            # Merge the responses, shifting chunk timestamps to the whole recording.
+            # Diarization runs per request, so labels are not matched across chunks.
+            text_parts = []
+            for response, offset in zip(responses, offsets):
+                logger.info(
+                    "Received transcription response",
+                    extra=self._summarize_response_for_logs(response),
+                )
+                
+                text = getattr(response, "text", "") or ""
+                duration = float(getattr(response, "duration", 0.0) or 0.0)
+                if text:
+                    text_parts.append(text)
+                result.duration_seconds = offset + duration
+                
+                # Responses without segments only contribute to full_text
+                result.segments.extend(self._parse_segments(response, offset))
+            result.full_text = " ".join(text_parts)
 
             logger.info(
                 "Parsed transcription top-level fields",
@@ -354,33 +426,6 @@ class SpeechTranscriber:
                 },
             )
             
-            # Parse segments with speaker information
-            # The diarize model includes speaker labels in the response
-            if hasattr(response, 'segments') and response.segments:
-                for segment in response.segments:
-                    # Extract speaker ID from the segment
-                    # gpt-4o-transcribe-diarize includes speaker info in segments
-                    speaker_id = self._get_segment_speaker_label(segment)
-                    if speaker_id is None:
-                        # Fallback: check for speaker in text or use default
-                        speaker_id = self._extract_speaker_from_segment(segment)
-                    
-                    trans_segment = TranscriptionSegment(
-                        speaker_id=speaker_id or "Speaker",
-                        text=(getattr(segment, "text", "") or "").strip(),
-                        start_time=float(getattr(segment, "start", 0.0) or 0.0),
-                        end_time=float(getattr(segment, "end", 0.0) or 0.0)
-                    )
-                    result.segments.append(trans_segment)
-            else:
-                # If no segments, create a single segment with full text
-                result.segments.append(TranscriptionSegment(
-                    speaker_id="Speaker 1",
-                    text=result.full_text,
-                    start_time=0.0,
-                    end_time=result.duration_seconds
-                ))
-            
             result.status = "completed"
             
             if on_progress:
@@ -398,47 +443,191 @@ class SpeechTranscriber:
             )
         
         finally:
-            # Clean up converted file if we created one
-            if converted_file_path and os.path.exists(converted_file_path):
-                try:
+            # Clean up chunks and the converted file if we created them
+            for _, chunk_path in chunks:
+                with suppress(OSError):
+                    os.remove(chunk_path)
+            if converted_file_path:
+                # A single remove; a missing file or other cleanup error is ignored
+                with suppress(OSError):
                     os.remove(converted_file_path)
                     logger.info(
                         "Cleaned up converted file",
                         extra={"audio_filename": result.filename, "converted_file_path": converted_file_path},
                     )
-                except OSError:
-                    pass  # Ignore cleanup errors
         
         return result
     
-    def _extract_speaker_from_segment(self, segment) -> str:
+    async def _prewarm_connection(self) -> None:
         """
-        Extract speaker ID from segment data.
-        The gpt-4o-transcribe-diarize model includes speaker info.
+        Open a connection to the endpoint with a cheap request.
+        
+        Runs while ffmpeg converts, so DNS and the TLS handshake are out of
+        the way before the upload. It is a single short attempt (no retries,
+        5 s timeout), so a slow or failing endpoint costs no rate-limit quota;
+        failures are left to the real request.
         """
-        # Check common attribute names for speaker
-        for attr in ['speaker', 'speaker_id', 'speakerId', 'speaker_label']:
-            if hasattr(segment, attr):
-                value = getattr(segment, attr)
-                if value is not None:
-                    return f"Speaker {value}" if isinstance(value, int) else str(value)
+        try:
+            await self.client.with_options(max_retries=0, timeout=5.0).models.list()
+        except Exception:
+            logger.debug("Connection prewarm failed", exc_info=True)
+
+    async def _transcribe_chunk(
+        self,
+        chunk_path: str,
+        create_kwargs: dict,
+        on_progress: Callable[[str], None] | None,
+    ):
+        """Transcribe one piece of a split recording, within the request cap."""
+        async with self._request_semaphore:
+            return await self._request_transcription(
+                chunk_path, os.path.basename(chunk_path), create_kwargs, on_progress
+            )
+
+    async def _request_transcription(
+        self,
+        audio: str | BinaryIO,
+        upload_name: str,
+        create_kwargs: dict,
+        on_progress: Callable[[str], None] | None,
+    ):
+        """Send the transcription request, falling back to json if the format is rejected."""
+        try:
+            return await self._create_transcription(audio, upload_name, create_kwargs)
+        except BadRequestError as e:
+            # If the configured response_format is unsupported by the deployed model, retry with json.
+            message = str(e)
+            if (
+                create_kwargs.get("response_format") != "json"
+                and "response_format" in message
+                and "not compatible" in message
+            ):
+                logger.warning(
+                    "response_format rejected by model; retrying with json",
+                    extra={"requested": create_kwargs.get("response_format")},
+                )
+                if on_progress:
+                    on_progress("Azure rejected response_format; retrying with json...")
+                create_kwargs["response_format"] = "json"
+                return await self._create_transcription(audio, upload_name, create_kwargs)
+            raise
+
+    def _parse_segments(self, response, offset: float = 0.0) -> list[TranscriptionSegment]:
+        """
+        Build segments from a response, shifting their times by offset seconds.
         
-        # Check if segment has an id that indicates speaker
-        if hasattr(segment, 'id'):
-            segment_id = segment.id
-            if isinstance(segment_id, str) and 'speaker' in segment_id.lower():
-                return segment_id
+        The diarize model includes speaker labels in the segments.
+        """
+        response_segments = getattr(response, "segments", None)
+        if not response_segments:
+            return []
         
+        # Segments in one response share a schema, so find the attribute
+        # carrying the speaker label once instead of probing every segment
+        speaker_attr = next(
+            (
+                name
+                for name in _SPEAKER_ATTRS
+                if hasattr(response_segments[0], name)
+            ),
+            None,
+        )
+        segments = []
+        append_segment = segments.append
+        speaker_for = self._segment_speaker
+        
+        try:
+            # Fast path: the SDK's segment models always carry text, start and end
+            for segment in response_segments:
+                append_segment(TranscriptionSegment(
+                    speaker_id=speaker_for(segment, speaker_attr),
+                    text=segment.text.strip(),
+                    start_time=offset + segment.start,
+                    end_time=offset + segment.end
+                ))
+        except (AttributeError, TypeError):
+            # Missing or null fields: start over with the defensive lookups
+            segments.clear()
+            for segment in response_segments:
+                append_segment(TranscriptionSegment(
+                    speaker_id=speaker_for(segment, speaker_attr),
+                    text=(getattr(segment, "text", "") or "").strip(),
+                    start_time=offset + float(getattr(segment, "start", 0.0) or 0.0),
+                    end_time=offset + float(getattr(segment, "end", 0.0) or 0.0)
+                ))
+        return segments
+
+    def _segment_speaker(self, segment, speaker_attr: str | None) -> str:
+        """
+        Speaker label of a segment.
+
+        gpt-4o-transcribe-diarize includes speaker info in segments: the
+        attribute found on the first segment (speaker_attr) is read first,
+        then the other speaker fields, then a segment id naming a speaker.
+        Numeric speakers are labelled "Speaker <n>".
+        """
+        value = getattr(segment, speaker_attr, None) if speaker_attr else None
+        if value is None:
+            for attr in _SPEAKER_ATTRS:
+                value = getattr(segment, attr, None)
+                if value is not None:
+                    break
+        if value is not None:
+            return f"Speaker {value}" if isinstance(value, int) else str(value)
+
+        segment_id = getattr(segment, "id", None)
+        if isinstance(segment_id, str) and "speaker" in segment_id.lower():
+            return segment_id
         return "Speaker"
 
+    async def _create_transcription(
+        self,
+        audio: str | BinaryIO,
+        upload_name: str,
+        create_kwargs: dict,
+    ):
+        """
+        Send the transcription request.
+
+        The SDK can only send a multipart file from bytes or a sync file
+        object, and httpx reads a file object on the event loop. Paths are
+        therefore read into bytes through aiofiles first; callers hold
+        _request_semaphore, which bounds the audio buffered this way (see
+        MAX_CONCURRENT_REQUESTS). In-memory file objects are already buffered
+        and never block, so they are passed through without a copy, rewound so
+        a retry resends the whole audio.
+        """
+        content_type = _CONTENT_TYPE_MAP.get(
+            os.path.splitext(upload_name)[1].lower(), "application/octet-stream"
+        )
+        if isinstance(audio, str):
+            async with aiofiles.open(audio, "rb") as audio_file:
+                audio_content = await audio_file.read()
+        else:
+            audio.seek(0)
+            audio_content = audio
+        return await self.client.audio.transcriptions.create(
+            file=(upload_name, audio_content, content_type), **create_kwargs
+        )
+
 
-# Singleton instance
 _transcriber: SpeechTranscriber | None = None
+_transcriber_lock = threading.Lock()
 
 
 def get_transcriber() -> SpeechTranscriber:
-    """Get singleton transcriber instance."""
+    """Get singleton transcriber instance (safe to call from worker threads)."""
     global _transcriber
     if _transcriber is None:
-        _transcriber = SpeechTranscriber()
+        with _transcriber_lock:
+            if _transcriber is None:
+                _transcriber = SpeechTranscriber()
     return _transcriber
+
+
+async def close_transcriber() -> None:
+    """Close the singleton transcriber's HTTP client, if it was ever created."""
+    global _transcriber
+    transcriber, _transcriber = _transcriber, None
+    if transcriber is not None:
+        await transcriber.client.close()
@@ -0,0 +1,108 @@
+"""
+Serialization and formatting shared by the transcription result types.
+
+Both engines produce the same result shape (segments with a speaker, text and
+timestamps, plus job metadata); only the segment class differs.
+"""
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
+from typing import ClassVar, Self
+
+import orjson
+
+_speaker_key = attrgetter("speaker_id")
+
+
+def group_by_speaker(segments: Iterable) -> Iterator[tuple[str, str]]:
+    """
+    Merge runs of adjacent segments from the same speaker.
+
+    Yields (speaker_id, text) pairs, with each run's texts joined by spaces.
+    Works for any segment type with ``speaker_id`` and ``text`` attributes.
+    """
+    for speaker, group in groupby(segments, key=_speaker_key):
+        yield speaker, " ".join(s.text for s in group)
+
+
+class TranscriptResultMixin:
+    """
+    JSON round-trip and plain-text formatting for a result dataclass.
+
+    The dataclass provides the result fields and a ``_segments_cache`` field,
+    and names its segment class in ``segment_type``.
+    """
+    __slots__ = ()
+
+    segment_type: ClassVar[type]
+
+    def _serialized_segments(self) -> list[dict]:
+        segments = self.segments
+        cache = self._segments_cache
+        if cache is None or cache[0] is not segments or cache[1] != len(segments):
+            # A dict display per segment is faster than dict(zip(...)) or
+            # orjson's dataclass support for slotted segments
+            cache = (
+                segments,
+                len(segments),
+                [
+                    {
+                        "speaker_id": s.speaker_id,
+                        "text": s.text,
+                        "start_time": s.start_time,
+                        "end_time": s.end_time,
+                    }
+                    for s in segments
+                ],
+            )
+            self._segments_cache = cache
+        return cache[2]
+
+    def to_dict(self) -> dict:
+        """
+        Convert to dictionary for JSON serialization.
+
+        Segments are serialized once and reused on later calls; segments are
+        not expected to be edited in place after transcription.
+        """
+        return {
+            "segments": self._serialized_segments(),
+            "full_text": self.full_text,
+            "status": self.status,
+            "error": self.error,
+            "filename": self.filename,
+            "created_at": self.created_at.isoformat(),
+            "language": self.language,
+            "duration_seconds": self.duration_seconds,
+        }
+
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes (orjson, reusing the cached segment dicts)."""
+        return orjson.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> Self:
+        """Rebuild a result from the output of ``to_dict``."""
+        segment_type = cls.segment_type
+        return cls(
+            segments=[
+                segment_type(s["speaker_id"], s["text"], s["start_time"], s["end_time"])
+                for s in data["segments"]
+            ],
+            full_text=data["full_text"],
+            status=data["status"],
+            error=data["error"],
+            filename=data["filename"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            language=data["language"],
+            duration_seconds=data["duration_seconds"],
+        )
+
+    def get_formatted_transcript(self) -> str:
+        """Get formatted transcript with speaker labels."""
+        if not self.segments:
+            return self.full_text
+        return "\n\n".join(
+            f"{speaker}: {text}" for speaker, text in group_by_speaker(self.segments)
+        )
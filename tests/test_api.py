@@ -1,16 +1,81 @@
 """
 Tests for the Transcription PoC API.
 """
+import asyncio
+import hashlib
+import io
+import os
+import time
+from tempfile import SpooledTemporaryFile
+
 import pytest
+from docx import Document
+from fastapi import HTTPException, UploadFile
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.main import _save_upload, app, job_store, result_cache, settings
+from app.services.speech_service import TranscriptionResult, TranscriptionSegment
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client."""
-    return TestClient(app)
+    """Create a test client, shared by all tests (requests are independent).
+
+    Entering the client runs the app's lifespan, which starts the job queue
+    and its workers.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class FakeTranscriber:
+    """Stands in for the OpenAI transcriber and counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def transcribe_file(self, audio, language, filename=None):
+        self.calls += 1
+        return TranscriptionResult(
+            segments=[TranscriptionSegment(speaker_id="Speaker 1", text="Hallo", end_time=1.5)],
+            full_text="Hallo",
+            status="completed",
+            filename=filename,
+            language=language,
+        )
+
+
+@pytest.fixture
+def fake_transcriber(monkeypatch):
+    """Route OpenAI-engine jobs to a FakeTranscriber."""
+    transcriber = FakeTranscriber()
+    monkeypatch.setattr("app.main.get_transcriber", lambda: transcriber)
+    return transcriber
+
+
+def _wait_for_job(client, job_id: str) -> dict:
+    """Poll a job until the worker pool has finished it."""
+    for _ in range(200):
+        data = client.get(f"/api/transcription/{job_id}").json()
+        if data["status"] != "processing":
+            return data
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def _upload(client, content: bytes, engine: str = "openai"):
+    return client.post(
+        "/api/transcribe",
+        files={"file": ("test.wav", content, "audio/wav")},
+        data={"language": "nl", "engine": engine},
+    )
+
+
+class FullQueue:
+    """A job queue that never has room."""
+
+    def put_nowait(self, job):
+        raise asyncio.QueueFull
 
 
 class TestHealthEndpoints:
@@ -48,27 +113,144 @@ class TestTranscriptionEndpoints:
         response = client.post("/api/transcribe")
         assert response.status_code == 422  # Validation error
     
-    def test_transcribe_invalid_format(self, client, tmp_path):
+    def test_transcribe_invalid_format(self, client):
         """Test transcribe endpoint with invalid file format."""
-        # Create a fake txt file
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("This is not an audio file")
-        
-        with open(test_file, "rb") as f:
-            response = client.post(
-                "/api/transcribe",
-                files={"file": ("test.txt", f, "text/plain")},
-                data={"language": "nl"}
-            )
+        response = client.post(
+            "/api/transcribe",
+            files={"file": ("test.txt", io.BytesIO(b"This is not an audio file"), "text/plain")},
+            data={"language": "nl"}
+        )
         
         assert response.status_code == 400
         assert "Unsupported file format" in response.json()["detail"]
     
+    def test_transcribe_file_too_large(self, client, monkeypatch):
+        """Test that uploads over the size limit are rejected."""
+        monkeypatch.setattr(settings, "max_file_size_mb", 0)
+        response = client.post(
+            "/api/transcribe",
+            files={"file": ("test.wav", b"RIFF" + b"\0" * 64, "audio/wav")},
+            data={"language": "nl"}
+        )
+
+        assert response.status_code == 413
+        assert "File too large" in response.json()["detail"]
+
+    def test_transcribe_rejects_content_length_before_reading(self, client, monkeypatch):
+        """Test that an oversized Content-Length is refused up front."""
+        monkeypatch.setattr(settings, "max_file_size_mb", 0)
+        response = client.post(
+            "/api/transcribe",
+            files={"file": ("test.wav", b"RIFF" + b"\0" * (128 * 1024), "audio/wav")},
+            data={"language": "nl"}
+        )
+
+        assert response.status_code == 413
+        assert "File too large" in response.json()["detail"]
+
+    def test_repeated_upload_is_served_from_cache(self, client, fake_transcriber):
+        """Test that an identical upload reuses the finished transcript."""
+        content = b"RIFF" + b"cache-hit" * 16
+        first = _upload(client, content)
+        assert first.json()["status"] == "processing"
+        assert _wait_for_job(client, first.json()["job_id"])["status"] == "completed"
+
+        second = _upload(client, content)
+        assert second.status_code == 200
+        data = second.json()
+        assert data["status"] == "completed"
+        assert "from cache" in data["message"]
+        assert fake_transcriber.calls == 1
+
+        cached = client.get(f"/api/transcription/{data['job_id']}").json()
+        assert cached["full_text"] == "Hallo"
+        assert cached["filename"] == "test.wav"
+
+    def test_delete_drops_cached_result(self, client, fake_transcriber):
+        """Test that deleting a transcription also removes it from the cache."""
+        content = b"RIFF" + b"cache-delete" * 16
+        job_id = _upload(client, content).json()["job_id"]
+        _wait_for_job(client, job_id)
+        assert len(result_cache) > 0
+
+        assert client.delete(f"/api/transcription/{job_id}").status_code == 200
+
+        response = _upload(client, content)
+        assert response.json()["status"] == "processing"
+        _wait_for_job(client, response.json()["job_id"])
+        assert fake_transcriber.calls == 2
+
+    def test_content_length_rejection_has_cors_headers(self, client, monkeypatch):
+        """Test that the early 413 is readable by cross-origin frontends."""
+        monkeypatch.setattr(settings, "max_file_size_mb", 0)
+        response = client.post(
+            "/api/transcribe",
+            files={"file": ("test.wav", b"RIFF" + b"\0" * (128 * 1024), "audio/wav")},
+            data={"language": "nl"},
+            headers={"Origin": "https://example.com"},
+        )
+
+        assert response.status_code == 413
+        assert response.headers["access-control-allow-origin"] == "https://example.com"
+
     def test_get_nonexistent_transcription(self, client):
         """Test getting a transcription that doesn't exist."""
         response = client.get("/api/transcription/nonexistent-id")
         assert response.status_code == 404
     
+    def test_get_transcription(self, client):
+        """Test getting a stored transcription result."""
+        result = TranscriptionResult(
+            segments=[TranscriptionSegment(speaker_id="Speaker 1", text="Hallo", end_time=1.5)],
+            full_text="Hallo",
+            status="completed",
+            filename="test.wav",
+        )
+        asyncio.run(job_store.put("test-job", result))
+
+        response = client.get("/api/transcription/test-job")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["segments"][0]["speaker_id"] == "Speaker 1"
+        assert data["segments"][0]["end_time"] == 1.5
+        assert data["created_at"] == result.created_at.isoformat()
+
+        asyncio.run(job_store.delete("test-job"))
+    
+    def test_export_transcription(self, client):
+        """Test exporting a stored transcription as Word and PDF."""
+        result = TranscriptionResult(
+            segments=[TranscriptionSegment(speaker_id="Speaker 1", text="Hallo & <welkom>")],
+            full_text="Hallo & <welkom>",
+            status="completed",
+            filename="test <1>.wav",
+        )
+        asyncio.run(job_store.put("export-job", result))
+
+        response = client.get("/api/transcription/export-job/export/word")
+        assert response.status_code == 200
+        assert response.content.startswith(b"PK")
+
+        response = client.get("/api/transcription/export-job/export/pdf")
+        assert response.status_code == 200
+        assert response.content.startswith(b"%PDF")
+
+        asyncio.run(job_store.delete("export-job"))
+    
+    def test_export_transcription_without_segments(self, client):
+        """Test that a result without segments exports its plain transcript."""
+        result = TranscriptionResult(full_text="Hallo allemaal", status="completed", filename="test.wav")
+        asyncio.run(job_store.put("plain-job", result))
+
+        response = client.get("/api/transcription/plain-job/export/word")
+        assert response.status_code == 200
+        paragraphs = [p.text for p in Document(io.BytesIO(response.content)).paragraphs]
+        assert "Hallo allemaal" in paragraphs
+
+        asyncio.run(job_store.delete("plain-job"))
+    
     def test_export_nonexistent_transcription_word(self, client):
         """Test exporting a transcription that doesn't exist."""
         response = client.get("/api/transcription/nonexistent-id/export/word")
@@ -80,6 +262,164 @@ class TestTranscriptionEndpoints:
         assert response.status_code == 404
 
 
+class TestJobQueue:
+    """Tests for queueing uploads and the worker pool."""
+
+    def test_upload_is_enqueued(self, client, monkeypatch, tmp_path):
+        """Test that an accepted upload is saved and queued for a worker."""
+        queue = asyncio.Queue()
+        monkeypatch.setattr(app.state, "job_queue", queue)
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        response = _upload(client, b"RIFF" + b"enqueue" * 16, engine="speech")
+
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+        job = queue.get_nowait()
+        assert job["job_id"] == job_id
+        assert job["engine"] == "speech"
+        assert (tmp_path / f"{job_id}.wav").exists()
+        assert client.get(f"/api/transcription/{job_id}").json()["status"] == "processing"
+
+        asyncio.run(job_store.delete(job_id))
+
+    def test_small_openai_upload_stays_in_memory(self, client, monkeypatch, tmp_path):
+        """Test that small native uploads for OpenAI are queued without touching disk."""
+        queue = asyncio.Queue()
+        monkeypatch.setattr(app.state, "job_queue", queue)
+        monkeypatch.setattr(app.state, "in_memory_bytes", 0)
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        content = b"RIFF" + b"in-memory" * 16
+        job_id = _upload(client, content).json()["job_id"]
+
+        job = queue.get_nowait()
+        assert job["file_path"] is None
+        assert job["audio"].getvalue() == content
+        assert job["filename"] == f"{job_id}.wav"
+        assert list(tmp_path.iterdir()) == []
+        assert app.state.in_memory_bytes == len(content)
+
+        asyncio.run(job_store.delete(job_id))
+
+    def test_in_memory_budget_sends_uploads_to_disk(self, client, monkeypatch, tmp_path):
+        """Test that uploads are saved to disk once in-memory jobs hold the budget."""
+        queue = asyncio.Queue()
+        monkeypatch.setattr(app.state, "job_queue", queue)
+        monkeypatch.setattr(app.state, "in_memory_bytes", settings.in_memory_total_mb * 1024 * 1024)
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        job_id = _upload(client, b"RIFF" + b"over-budget" * 16).json()["job_id"]
+
+        job = queue.get_nowait()
+        assert "audio" not in job
+        assert job["file_path"] == str(tmp_path / f"{job_id}.wav")
+
+        asyncio.run(job_store.delete(job_id))
+
+    def test_in_memory_upload_respects_max_file_size(self, client, monkeypatch, tmp_path):
+        """Test that the in-memory path does not bypass the upload size limit."""
+        monkeypatch.setattr(settings, "max_file_size_mb", 0)
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        response = _upload(client, b"RIFF" + b"small" * 16)
+
+        assert response.status_code == 413
+
+    def test_full_queue_returns_503(self, client, monkeypatch, tmp_path):
+        """Test that uploads are refused, and cleaned up, when the queue is full."""
+        monkeypatch.setattr(app.state, "job_queue", FullQueue())
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        linked_jobs = len(result_cache._job_keys)
+        response = _upload(client, b"RIFF" + b"queue-full" * 16, engine="speech")
+
+        assert response.status_code == 503
+        assert "Too many transcriptions" in response.json()["detail"]
+        assert list(tmp_path.iterdir()) == []
+        assert len(result_cache._job_keys) == linked_jobs
+
+    def test_worker_completes_job(self, client, monkeypatch, tmp_path, fake_transcriber):
+        """Test that a worker transcribes a saved upload and removes the file."""
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "in_memory_upload_max_mb", 0)
+        job_id = _upload(client, b"RIFF" + b"worker" * 16).json()["job_id"]
+
+        data = _wait_for_job(client, job_id)
+        assert data["status"] == "completed"
+        assert data["full_text"] == "Hallo"
+        assert fake_transcriber.calls == 1
+        assert not (tmp_path / f"{job_id}.wav").exists()
+
+
+class TestSaveUpload:
+    """Tests for writing uploads to disk."""
+
+    def test_oversized_upload_leaves_no_part_file(self, tmp_path):
+        """Test that an upload over the limit is rejected without leftovers."""
+        upload = UploadFile(io.BytesIO(b"x" * 100), filename="test.wav")
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(_save_upload(upload, tmp_path / "job.wav", max_bytes=10))
+        assert exc_info.value.status_code == 413
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spooled_upload_is_hashed_while_copied(self, tmp_path):
+        """Test that an upload spooled to disk is copied and hashed in one pass."""
+        content = os.urandom(3 * 1024 * 1024)
+        spooled = SpooledTemporaryFile(max_size=1024)
+        spooled.write(content)
+        spooled.seek(0)
+        digest = hashlib.sha256()
+
+        asyncio.run(_save_upload(UploadFile(spooled, filename="test.wav"), tmp_path / "job.wav", len(content), digest))
+        assert (tmp_path / "job.wav").read_bytes() == content
+        assert digest.hexdigest() == hashlib.sha256(content).hexdigest()
+
+    def test_spooled_upload_is_copied_with_sendfile(self, tmp_path, monkeypatch):
+        """Test that an unhashed upload spooled to disk is copied in the kernel."""
+        content = os.urandom(3 * 1024 * 1024)
+        spooled = SpooledTemporaryFile(max_size=1024)
+        spooled.write(content)
+        spooled.seek(0)
+        calls = []
+        sendfile = os.sendfile
+        monkeypatch.setattr(os, "sendfile", lambda *args: calls.append(args) or sendfile(*args))
+
+        upload = UploadFile(spooled, size=len(content), filename="test.wav")
+        asyncio.run(_save_upload(upload, tmp_path / "job.wav", len(content)))
+        assert (tmp_path / "job.wav").read_bytes() == content
+        assert calls
+
+    def test_short_sendfile_copy_leaves_no_file(self, tmp_path, monkeypatch):
+        """Test that a copy ending before the upload's size is an error, not a truncated file."""
+        content = os.urandom(3 * 1024 * 1024)
+        spooled = SpooledTemporaryFile(max_size=1024)
+        spooled.write(content)
+        spooled.seek(0)
+        sendfile = os.sendfile
+
+        def source_shrinks(out_fd, in_fd, offset, count):
+            # The first call copies 1 MiB, then the source reports end of file
+            return sendfile(out_fd, in_fd, offset, min(count, 1024 * 1024)) if offset == 0 else 0
+
+        monkeypatch.setattr(os, "sendfile", source_shrinks)
+
+        upload = UploadFile(spooled, size=len(content), filename="test.wav")
+        with pytest.raises(OSError):
+            asyncio.run(_save_upload(upload, tmp_path / "job.wav", len(content)))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_read_leaves_no_part_file(self, tmp_path):
+        """Test that an upload failing mid-stream leaves neither file behind."""
+        class BrokenFile(io.BytesIO):
+            def read(self, size=-1):
+                if self.tell():
+                    raise OSError("connection reset")
+                return super().read(size)
+
+        upload = UploadFile(BrokenFile(b"x" * (2 * 1024 * 1024)), filename="test.wav")
+
+        with pytest.raises(OSError):
+            asyncio.run(_save_upload(upload, tmp_path / "job.wav", max_bytes=10 * 1024 * 1024))
+        assert list(tmp_path.iterdir()) == []
+
+
 class TestStaticFiles:
     """Tests for static file serving."""
     
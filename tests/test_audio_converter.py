@@ -1,15 +1,21 @@
 """
 Tests for audio conversion utilities.
 """
+import subprocess
+
 import pytest
 from pathlib import Path
 
+from app.services import audio_converter
 from app.services.audio_converter import (
     NATIVE_FORMATS,
     CONVERTIBLE_FORMATS,
     ACCEPTED_FORMATS,
     needs_conversion,
     is_ffmpeg_available,
+    get_audio_duration,
+    get_audio_info,
+    reset_ffmpeg_cache,
 )
 
 
@@ -67,3 +73,107 @@ class TestFfmpegAvailability:
         """is_ffmpeg_available should return boolean."""
         result = is_ffmpeg_available()
         assert isinstance(result, bool)
+    
+    def test_ffmpeg_check_is_cached(self, monkeypatch):
+        """The PATH lookup runs once until the cache is reset."""
+        calls = []
+        monkeypatch.setattr(audio_converter.shutil, "which", lambda name: calls.append(name))
+        reset_ffmpeg_cache()
+        try:
+            assert not is_ffmpeg_available()
+            assert not is_ffmpeg_available()
+            assert calls == ["ffmpeg"]
+        finally:
+            reset_ffmpeg_cache()
+
+
+class TestAudioInfo:
+    """Tests for ffprobe-based audio info."""
+    
+    def test_probe_is_cached_per_file(self, tmp_path, monkeypatch):
+        """Duration and info for an unchanged file share a single ffprobe call."""
+        calls = []
+        
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            stdout = '{"streams": [{"codec_name": "pcm_s16le", "sample_rate": "16000", "channels": 2}], "format": {"duration": "12.5"}}'
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+        
+        reset_ffmpeg_cache()
+        monkeypatch.setattr(audio_converter, "is_ffmpeg_available", lambda: True)
+        monkeypatch.setattr(audio_converter.subprocess, "run", fake_run)
+        
+        test_file = tmp_path / "test.wav"
+        test_file.write_bytes(b"RIFF")
+        
+        info = get_audio_info(str(test_file))
+        assert info["duration"] == 12.5
+        assert info["sample_rate"] == 16000
+        assert info["channels"] == 2
+        assert get_audio_duration(str(test_file)) == 12.5
+        assert len(calls) == 1
+        
+        # Changing the file invalidates the cached probe
+        test_file.write_bytes(b"RIFF" + b"\0" * 16)
+        get_audio_info(str(test_file))
+        assert len(calls) == 2
+    
+    def test_missing_file_returns_defaults(self, tmp_path):
+        """Unknown files return empty info instead of raising."""
+        info = get_audio_info(str(tmp_path / "missing.asf"))
+        assert info["format"] == ".asf"
+        assert info["duration"] is None
+
+
+class TestSplitAtSilence:
+    """Tests for choosing where long recordings are split."""
+
+    def test_parse_silences_pairs_start_and_end(self):
+        """Silences still open at the end of the file are dropped."""
+        stderr = (
+            "[silencedetect @ 0x1] silence_start: 12.5\n"
+            "[silencedetect @ 0x1] silence_end: 13.5 | silence_duration: 1\n"
+            "[silencedetect @ 0x1] silence_start: 90\n"
+        )
+        assert audio_converter._parse_silences(stderr) == [(12.5, 13.5)]
+
+    def test_cuts_prefer_latest_silence(self):
+        """Pieces end in the last silence of their window, or hard at the limit."""
+        silences = [(100.0, 102.0), (200.0, 204.0), (500.0, 501.0)]
+        cuts = audio_converter._choose_cut_points(700.0, silences, 300.0)
+        assert cuts == [202.0, 500.5]
+
+        assert audio_converter._choose_cut_points(650.0, [], 300.0) == [300.0, 600.0]
+        assert audio_converter._choose_cut_points(250.0, silences, 300.0) == []
+
+    def test_estimate_wav_size(self, monkeypatch):
+        """The estimate covers 16 kHz 16-bit PCM in the source's channel count."""
+        info = {"duration": 10.0, "channels": 2}
+        monkeypatch.setattr(audio_converter, "get_audio_info", lambda path: info)
+        assert audio_converter.estimate_wav_size("a.wma") == 44 + 10 * 16000 * 2 * 2
+
+        info["duration"] = None
+        assert audio_converter.estimate_wav_size("a.wma") is None
+
+    @pytest.mark.parametrize(("channels", "pieces"), [(2, 2), (6, 4), (None, 2)])
+    def test_piece_length_follows_channels(self, tmp_path, monkeypatch, channels, pieces):
+        """Pieces of many-channel audio are shorter; unknown layouts are downmixed."""
+        source = tmp_path / "long.wma"
+        source.write_bytes(b"\0")
+        commands = []
+
+        def run(cmd, **kwargs):
+            commands.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr(audio_converter, "is_ffmpeg_available", lambda: True)
+        monkeypatch.setattr(audio_converter, "get_audio_info", lambda path: {"duration": 400.0, "channels": channels})
+        monkeypatch.setattr(audio_converter, "detect_silences", lambda path: [])
+        monkeypatch.setattr(audio_converter.subprocess, "run", run)
+
+        chunks = audio_converter.split_at_silence(str(source))
+        assert len(chunks) == pieces
+        for cmd in commands:
+            length = float(cmd[cmd.index("-t") + 1])
+            assert 44 + length * 16000 * 2 * (channels or 2) <= audio_converter.SPLIT_CHUNK_BYTES
+            assert ("-ac" in cmd) == (channels is None)
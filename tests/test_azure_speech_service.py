@@ -0,0 +1,111 @@
+"""
+Tests for the Azure Speech transcription service.
+"""
+import asyncio
+import sys
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services import azure_speech_service
+from app.services.azure_speech_service import AzureSpeechTranscriber, _iter_stream, _stop_conversion
+
+
+async def _python_process(code: str) -> asyncio.subprocess.Process:
+    """Start a Python snippet with piped stdout and stderr, like an ffmpeg stream."""
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-c", code,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+
+class RejectingClient:
+    """Reads the whole upload, then answers like Azure does for bad audio."""
+
+    async def post(self, url, content, headers):
+        async for _ in content:
+            pass
+        return httpx.Response(400, text="Audio could not be decoded")
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    """A transcriber whose HTTP client is a RejectingClient."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "azure_speech_key", "test-key")
+    monkeypatch.setattr(settings, "azure_speech_region", "westeurope")
+    transcriber = AzureSpeechTranscriber()
+    transcriber._client = RejectingClient()
+    return transcriber
+
+
+class TestStopConversion:
+    """Tests for stopping an ffmpeg stream whose upload ended early."""
+
+    async def test_stops_process_blocked_on_full_pipe(self):
+        """A writer stuck on an unread stdout pipe is killed and reaped."""
+        process = await _python_process("import sys\nwhile True: sys.stdout.buffer.write(b'x' * 65536)")
+        stderr_task = asyncio.create_task(process.stderr.read())
+        await asyncio.sleep(0.2)  # let the pipe fill up
+
+        await asyncio.wait_for(_stop_conversion(process, stderr_task), timeout=10)
+        assert process.returncode is not None
+
+
+class TestStreamedConversion:
+    """Tests for ffmpeg output streamed into the upload."""
+
+    async def test_stalled_conversion_hits_deadline(self):
+        """A process that never closes stdout ends the stream at the deadline."""
+        process = await _python_process("import time\ntime.sleep(30)")
+        stderr_task = asyncio.create_task(process.stderr.read())
+        deadline = asyncio.get_running_loop().time() + 0.2
+
+        with pytest.raises(RuntimeError, match="timed out"):
+            async for _ in _iter_stream(process.stdout, deadline):
+                pass
+        await asyncio.wait_for(_stop_conversion(process, stderr_task), timeout=10)
+        assert process.returncode is not None
+
+    async def test_failed_conversion_is_reported_over_api_error(self, transcriber, monkeypatch, tmp_path):
+        """ffmpeg's own error is reported, not Azure's reaction to the empty audio."""
+        async def failing_stream(path):
+            return await _python_process("import sys\nsys.stderr.write('Invalid data found')\nsys.exit(1)")
+
+        monkeypatch.setattr(azure_speech_service, "is_ffmpeg_available", lambda: True)
+        monkeypatch.setattr(azure_speech_service, "convert_to_ogg_opus_stream", failing_stream)
+        upload = tmp_path / "broken.avi"
+        upload.write_bytes(b"\0" * 64)
+
+        result = await transcriber.transcribe_file(str(upload), "nl")
+
+        assert result.status == "error"
+        assert result.error == "ffmpeg conversion failed: Invalid data found"
+
+
+class TestUnsegmentedResponse:
+    """Tests for responses that carry text but no phrases."""
+
+    async def test_full_text_is_the_transcript(self, transcriber, tmp_path):
+        """No speaker segment is invented; the formatted transcript is the combined text."""
+        class CombinedOnlyClient:
+            async def post(self, url, content, headers):
+                async for _ in content:
+                    pass
+                return httpx.Response(
+                    200,
+                    json={"durationMilliseconds": 2000, "phrases": [], "combinedPhrases": [{"text": "Hallo allemaal"}]},
+                )
+
+        transcriber._client = CombinedOnlyClient()
+        upload = tmp_path / "short.wav"
+        upload.write_bytes(b"RIFF" + b"\0" * 64)
+
+        result = await transcriber.transcribe_file(str(upload), "nl")
+
+        assert result.status == "completed"
+        assert result.segments == []
+        assert result.full_text == "Hallo allemaal"
+        assert result.get_formatted_transcript() == "Hallo allemaal"
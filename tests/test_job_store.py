@@ -0,0 +1,56 @@
+"""
+Tests for the transcription job store.
+"""
+
+from app.services.job_store import JobStore
+from app.services.speech_service import TranscriptionResult
+
+
+class TestJobStore:
+    """Tests for JobStore."""
+
+    async def test_put_and_get(self):
+        """Stored results can be retrieved by job ID."""
+        store = JobStore()
+        result = TranscriptionResult(filename="test.wav")
+        await store.put("job-1", result)
+        assert await store.get("job-1") is result
+        assert await store.get("unknown") is None
+
+    async def test_delete(self):
+        """Deleting reports whether the job existed."""
+        store = JobStore()
+        await store.put("job-1", TranscriptionResult())
+        assert await store.delete("job-1")
+        assert not await store.delete("job-1")
+        assert await store.get("job-1") is None
+
+    async def test_evicts_least_recently_used(self):
+        """The store never grows beyond max_entries."""
+        store = JobStore(max_entries=2)
+        await store.put("a", TranscriptionResult())
+        await store.put("b", TranscriptionResult())
+        await store.get("a")  # "b" is now least recently used
+        await store.put("c", TranscriptionResult())
+        assert len(store) == 2
+        assert await store.get("a") is not None
+        assert await store.get("b") is None
+
+    async def test_expired_entries_are_dropped(self):
+        """Entries older than the TTL are treated as missing."""
+        store = JobStore(ttl_seconds=0)
+        await store.put("job-1", TranscriptionResult())
+        assert await store.get("job-1") is None
+        assert len(store) == 0
+
+    async def test_get_json_reflects_latest_put(self):
+        """The cached JSON is refreshed whenever a result is stored."""
+        store = JobStore()
+        result = TranscriptionResult(status="processing")
+        await store.put("job-1", result)
+        assert b'"status":"processing"' in await store.get_json("job-1")
+
+        result.status = "completed"
+        await store.put("job-1", result)
+        assert b'"status":"completed"' in await store.get_json("job-1")
+        assert await store.get_json("unknown") is None
@@ -0,0 +1,106 @@
+"""
+Tests for the transcription result cache.
+"""
+
+import os
+import time
+
+from app.services.azure_speech_service import SpeechSegment, SpeechTranscriptionResult
+from app.services.result_cache import ResultCache, cache_key
+from app.services.speech_service import TranscriptionResult, TranscriptionSegment
+
+
+def _result() -> TranscriptionResult:
+    return TranscriptionResult(
+        segments=[TranscriptionSegment(speaker_id="Speaker 1", text="Hallo", end_time=1.5)],
+        full_text="Hallo",
+        status="completed",
+        filename="test.wav",
+        duration_seconds=1.5,
+    )
+
+
+class TestResultCache:
+    """Tests for ResultCache."""
+
+    async def test_get_returns_copy(self):
+        """Hits return an equal result that can be modified independently."""
+        cache = ResultCache()
+        result = _result()
+        await cache.put("key", result)
+
+        cached = await cache.get("key")
+        assert cached == result
+        assert cached is not result
+        cached.filename = "other.wav"
+        assert (await cache.get("key")).filename == "test.wav"
+        assert await cache.get("unknown") is None
+
+    async def test_persisted_across_instances(self, tmp_path):
+        """Results written to the cache directory are found by a new cache."""
+        result = _result()
+        await ResultCache(directory=str(tmp_path)).put("key", result)
+
+        assert await ResultCache(directory=str(tmp_path)).get("key") == result
+        assert (tmp_path / "key.json").exists()
+
+    async def test_expired_entries_are_dropped(self, tmp_path):
+        """Entries older than the TTL are treated as missing, on disk too."""
+        cache = ResultCache(ttl_seconds=0, directory=str(tmp_path))
+        await cache.put("key", _result())
+        assert await cache.get("key") is None
+        assert not (tmp_path / "key.json").exists()
+
+    async def test_keeps_result_type(self, tmp_path):
+        """Azure Speech results come back as SpeechTranscriptionResult."""
+        result = SpeechTranscriptionResult(
+            segments=[SpeechSegment("Speaker 1", "Hallo", 0.0, 1.5)],
+            full_text="Hallo",
+            status="completed",
+            filename="test.wav",
+        )
+        await ResultCache(directory=str(tmp_path)).put("key", result)
+
+        cached = await ResultCache(directory=str(tmp_path)).get("key")
+        assert type(cached) is SpeechTranscriptionResult
+        assert cached == result
+
+    async def test_directory_is_pruned(self, tmp_path):
+        """The oldest files beyond max_entries are removed from disk."""
+        cache = ResultCache(max_entries=2, directory=str(tmp_path))
+        for index, key in enumerate(("a", "b", "c")):
+            await cache.put(key, _result())
+            mtime = time.time() - 60 + index
+            os.utime(tmp_path / f"{key}.json", (mtime, mtime))
+        await cache.put("d", _result())
+
+        assert sorted(p.name for p in tmp_path.glob("*.json")) == ["c.json", "d.json"]
+
+    async def test_delete_job(self, tmp_path):
+        """Deleting a linked job removes its entry from memory and disk."""
+        cache = ResultCache(directory=str(tmp_path))
+        await cache.put("key", _result())
+        cache.link_job("job", "key")
+
+        await cache.delete_job("job")
+        assert len(cache) == 0
+        assert not (tmp_path / "key.json").exists()
+        await cache.delete_job("job")
+
+    async def test_shared_entry_kept_until_last_job_deleted(self):
+        """An entry linked to several jobs survives until the last one is deleted."""
+        cache = ResultCache()
+        await cache.put("key", _result())
+        cache.link_job("first", "key")
+        cache.link_job("second", "key")
+
+        await cache.delete_job("first")
+        assert await cache.get("key") is not None
+        await cache.delete_job("second")
+        assert await cache.get("key") is None
+
+    def test_key_depends_on_settings(self):
+        """The same audio under other settings gets a different key."""
+        assert cache_key("abc", "openai", "nl") == cache_key("abc", "openai", "nl")
+        assert cache_key("abc", "openai", "nl") != cache_key("abc", "openai", "en")
+        assert cache_key("abc", "speech", "nl") != cache_key("abc", "openai", "nl")
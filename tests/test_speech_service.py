@@ -0,0 +1,216 @@
+"""
+Tests for the Azure OpenAI transcriber.
+"""
+import asyncio
+import io
+import os
+import types
+
+import pytest
+
+from app.config import get_settings
+from app.services import speech_service
+from app.services.azure_speech_service import SpeechSegment, SpeechTranscriptionResult
+from app.services.speech_service import SpeechTranscriber, TranscriptionResult, TranscriptionSegment
+
+
+class FakeTranscriptions:
+    """Answers transcription requests with one segment per upload."""
+
+    def __init__(self):
+        self.uploads = []
+
+    async def create(self, file, **kwargs):
+        name, audio, _ = file
+        self.uploads.append(name)
+        segment = types.SimpleNamespace(text=f" {name} ", start=0.0, end=1.0, speaker="A")
+        return types.SimpleNamespace(text=name, duration=300.0, segments=[segment])
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    """A transcriber whose client is a FakeTranscriptions."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "azure_openai_endpoint", "https://example.openai.azure.com")
+    monkeypatch.setattr(settings, "azure_openai_api_key", "test-key")
+    transcriber = SpeechTranscriber()
+    transcriber.client = types.SimpleNamespace(
+        audio=types.SimpleNamespace(transcriptions=FakeTranscriptions())
+    )
+    return transcriber
+
+
+@pytest.fixture
+def split_upload(tmp_path, monkeypatch):
+    """An upload that is always over the limit and splits into two pieces."""
+    upload = tmp_path / "long.wav"
+    upload.write_bytes(b"RIFF" + b"\0" * 64)
+    chunks = [(0.0, str(tmp_path / "long_chunk000.wav")), (300.0, str(tmp_path / "long_chunk001.wav"))]
+
+    def split(path):
+        for _, chunk_path in chunks:
+            with open(chunk_path, "wb") as f:
+                f.write(b"RIFF")
+        return chunks
+
+    monkeypatch.setattr(speech_service, "MAX_UPLOAD_MB", 0)
+    monkeypatch.setattr(speech_service, "is_ffmpeg_available", lambda: True)
+    monkeypatch.setattr(speech_service, "split_at_silence", split)
+    return str(upload), [path for _, path in chunks]
+
+
+class TestSplitTranscription:
+    """Tests for recordings that are split and transcribed in pieces."""
+
+    async def test_pieces_are_merged_in_order(self, transcriber, split_upload):
+        """Piece timestamps are shifted to the whole recording."""
+        upload, chunk_paths = split_upload
+        result = await transcriber.transcribe_file(upload, "nl")
+
+        assert result.status == "completed"
+        assert [(s.text, s.start_time) for s in result.segments] == [
+            ("long_chunk000.wav", 0.0),
+            ("long_chunk001.wav", 300.0),
+        ]
+        assert result.full_text == "long_chunk000.wav long_chunk001.wav"
+        assert result.duration_seconds == 600.0
+        assert not any(os.path.exists(path) for path in chunk_paths)
+
+    async def test_failed_piece_stops_the_others_before_cleanup(self, transcriber, split_upload):
+        """When one piece fails, the others are cancelled before their files are removed."""
+        upload, chunk_paths = split_upload
+        seen_on_cancel = []
+        first_started = asyncio.Event()
+
+        async def create(file, **kwargs):
+            name, _, _ = file
+            if name == "long_chunk001.wav":
+                await first_started.wait()
+                raise RuntimeError("upload failed")
+            first_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                seen_on_cancel.append(os.path.exists(chunk_paths[0]))
+                raise
+
+        transcriber.client.audio.transcriptions.create = create
+        result = await transcriber.transcribe_file(upload, "nl")
+
+        assert result.status == "error"
+        assert result.error == "upload failed"
+        assert seen_on_cancel == [True]
+        assert not any(os.path.exists(path) for path in chunk_paths)
+
+
+class TestUnsegmentedResponse:
+    """Tests for responses that carry text but no segments."""
+
+    async def test_full_text_is_the_transcript(self, transcriber, tmp_path):
+        """No speaker segment is invented; the formatted transcript is the plain text."""
+        upload = tmp_path / "short.wav"
+        upload.write_bytes(b"RIFF" + b"\0" * 64)
+
+        async def create(file, **kwargs):
+            return types.SimpleNamespace(text="Hallo allemaal", duration=2.0, segments=[])
+
+        transcriber.client.audio.transcriptions.create = create
+        result = await transcriber.transcribe_file(str(upload), "nl")
+
+        assert result.status == "completed"
+        assert result.segments == []
+        assert result.full_text == "Hallo allemaal"
+        assert result.get_formatted_transcript() == "Hallo allemaal"
+
+
+class TestUploadBody:
+    """Tests for how audio is handed to the SDK."""
+
+    async def test_path_is_sent_as_bytes_and_memory_without_copy(self, transcriber, tmp_path):
+        """Files are read off the loop into bytes; in-memory audio is passed through rewound."""
+        sent = []
+
+        async def create(file, **kwargs):
+            sent.append(file[1])
+            return types.SimpleNamespace(text="Hallo", duration=1.0, segments=[])
+
+        transcriber.client.audio.transcriptions.create = create
+        upload = tmp_path / "short.wav"
+        upload.write_bytes(b"RIFF" + b"\0" * 64)
+        audio = io.BytesIO(b"RIFF" + b"\1" * 64)
+        audio.seek(10)
+
+        await transcriber.transcribe_file(str(upload), "nl")
+        await transcriber.transcribe_file(audio, "nl", filename="memory.wav")
+
+        assert sent[0] == upload.read_bytes()
+        assert sent[1] is audio
+        assert audio.tell() == 0
+
+
+class TestPrewarm:
+    """Tests for warming up the connection during conversion."""
+
+    async def test_conversion_does_not_wait_for_prewarm(self, transcriber, tmp_path, monkeypatch):
+        """A hanging prewarm is a single no-retry attempt and never delays the job."""
+        prewarm_options = []
+
+        async def hanging_list():
+            await asyncio.sleep(30)
+
+        def with_options(**options):
+            prewarm_options.append(options)
+            return types.SimpleNamespace(models=types.SimpleNamespace(list=hanging_list))
+
+        def convert(source, output, on_progress=None):
+            with open(output, "wb") as f:
+                f.write(b"RIFF" + b"\0" * 64)
+
+        transcriber.client.with_options = with_options
+        monkeypatch.setattr(speech_service, "is_ffmpeg_available", lambda: True)
+        monkeypatch.setattr(speech_service, "estimate_wav_size", lambda path: 1024)
+        monkeypatch.setattr(speech_service, "convert_to_wav", convert)
+        upload = tmp_path / "meeting.wma"
+        upload.write_bytes(b"\0" * 64)
+
+        result = await asyncio.wait_for(transcriber.transcribe_file(str(upload), "nl"), timeout=5)
+
+        assert result.status == "completed"
+        assert prewarm_options == [{"max_retries": 0, "timeout": 5.0}]
+
+
+class TestSegmentSpeaker:
+    """Tests for reading speaker labels off response segments."""
+
+    def test_labels_are_formatted_once(self, transcriber):
+        """The first speaker field found is used; numeric speakers get a readable label."""
+        label = types.SimpleNamespace(speaker="A")
+        numbered = types.SimpleNamespace(speaker_id=2)
+        by_id = types.SimpleNamespace(id="speaker_3")
+        unknown = types.SimpleNamespace(id="seg_0")
+
+        assert transcriber._segment_speaker(label, "speaker") == "A"
+        assert transcriber._segment_speaker(numbered, "speaker") == "Speaker 2"
+        assert transcriber._segment_speaker(numbered, None) == "Speaker 2"
+        assert transcriber._segment_speaker(by_id, None) == "speaker_3"
+        assert transcriber._segment_speaker(unknown, None) == "Speaker"
+
+
+class TestResultFormat:
+    """Tests for the serialization and formatting both result types share."""
+
+    def test_both_engines_format_alike(self):
+        """Adjacent segments of a speaker are merged, and results round-trip to their own type."""
+        parts = [("A", "Goedemorgen"), ("A", "allemaal."), ("B", "Hallo."), ("A", "Beginnen?")]
+        results = [
+            TranscriptionResult(segments=[TranscriptionSegment(*p) for p in parts], status="completed"),
+            SpeechTranscriptionResult(segments=[SpeechSegment(*p) for p in parts], status="completed"),
+        ]
+
+        for result in results:
+            assert result.get_formatted_transcript() == (
+                "A: Goedemorgen allemaal.\n\nB: Hallo.\n\nA: Beginnen?"
+            )
+            copy = type(result).from_dict(result.to_dict())
+            assert copy == result
+            assert type(copy.segments[0]) is type(result).segment_type